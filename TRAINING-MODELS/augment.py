@@ -0,0 +1,149 @@
+import os
+import time
+import zlib
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+NUM_THREADS = os.cpu_count() or 4
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+def load_rgb(path, target_size=(224,224)):
+    img = cv2.imread(path)
+    if img is None:
+        return None
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    return cv2.resize(img, target_size)
+
+def save_rgb(path, img):
+    return cv2.imwrite(path, cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+
+class BatchAugmenter:
+    """Mismas transformaciones que ImageDataGenerator, pero aplicadas a todo un lote a la vez.
+
+    Rangos con la misma semántica que Keras: grados para rotación y corte, fracción del
+    tamaño para los desplazamientos, fill_mode='nearest' e interpolación bilineal.
+    Cada (imagen, variante) tiene su propia semilla derivada de (seed, nombre, variante),
+    así que el resultado no depende del orden ni del tamaño del lote.
+    """
+
+    NUM_PARAMS = 9
+
+    def __init__(self, rotation_range=0, width_shift_range=0, height_shift_range=0,
+                 shear_range=0, zoom_range=0, horizontal_flip=False,
+                 brightness_range=None, channel_shift_range=0, seed=42):
+        self.rotation_range = rotation_range
+        self.width_shift_range = width_shift_range
+        self.height_shift_range = height_shift_range
+        self.shear_range = shear_range
+        self.zoom_range = zoom_range
+        self.horizontal_flip = horizontal_flip
+        self.brightness_range = brightness_range or (1.0, 1.0)
+        self.channel_shift_range = channel_shift_range
+        self.seed = seed
+
+    def random_uniforms(self, names, variants):
+        """(n, NUM_PARAMS) valores en [0, 1), uno por parámetro y por imagen"""
+        return np.stack([
+            np.random.default_rng([self.seed, zlib.crc32(name.encode()), int(k)]).random(self.NUM_PARAMS)
+            for name, k in zip(names, variants)
+        ])
+
+    def _source_coords(self, u, h, w):
+        """Para cada píxel de salida, de qué coordenada (x, y) de la imagen original se lee"""
+        sym = lambda col, r: (2 * u[:, col] - 1) * r  # U(-r, r) por imagen
+        theta = np.deg2rad(sym(0, self.rotation_range))
+        tx = sym(1, self.width_shift_range) * w
+        ty = sym(2, self.height_shift_range) * h
+        shear = np.deg2rad(sym(3, self.shear_range))
+        zx = 1 + sym(4, self.zoom_range)
+        zy = 1 + sym(5, self.zoom_range)
+        flip = (u[:, 6] < 0.5) & bool(self.horizontal_flip)
+
+        # rotación @ corte @ zoom, igual que apply_affine_transform (salida -> entrada)
+        cos, sin = np.cos(theta), np.sin(theta)
+        rotation = np.stack([np.stack([cos, -sin], -1), np.stack([sin, cos], -1)], -2)
+        shearing = np.stack([np.stack([np.ones_like(shear), -np.sin(shear)], -1),
+                             np.stack([np.zeros_like(shear), np.cos(shear)], -1)], -2)
+        zooming = np.zeros_like(rotation)
+        zooming[:, 0, 0], zooming[:, 1, 1] = zx, zy
+        m = rotation @ shearing @ zooming  # (n, 2, 2)
+
+        cx, cy = (w - 1) / 2, (h - 1) / 2
+        xs = np.arange(w, dtype=np.float32)[None, None, :] - cx
+        ys = np.arange(h, dtype=np.float32)[None, :, None] - cy
+        xs = np.where(flip[:, None, None], -xs, xs)  # volteo horizontal antes de la transformación
+        m = m[:, :, :, None, None].astype(np.float32)
+        src_x = m[:, 0, 0] * xs + m[:, 0, 1] * ys + (cx + tx).astype(np.float32)[:, None, None]
+        src_y = m[:, 1, 0] * xs + m[:, 1, 1] * ys + (cy + ty).astype(np.float32)[:, None, None]
+        return src_x, src_y
+
+    def apply(self, images, names, variants):
+        """images: uint8 (n, h, w, 3). Devuelve uint8 (n, h, w, 3)"""
+        h, w = images.shape[1:3]
+        u = self.random_uniforms(names, variants)
+        src_x, src_y = self._source_coords(u, h, w)
+
+        # los mapas de coordenadas se calculan para todo el lote; el muestreo bilineal lo hace
+        # cv2.remap (SIMD y multihilo), con el borde repetido como fill_mode='nearest'
+        out = np.stack([
+            cv2.remap(img, mx, my, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+            for img, mx, my in zip(images, src_x, src_y)
+        ]).astype(np.float32)
+
+        # brillo (multiplicativo) y desplazamiento de canal (aditivo), por imagen
+        lo, hi = self.brightness_range
+        brightness = (lo + u[:, 7] * (hi - lo)).astype(np.float32)
+        shift = ((2 * u[:, 8] - 1) * self.channel_shift_range).astype(np.float32)
+        out = out * brightness[:, None, None, None] + shift[:, None, None, None]
+        return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+def augment_folder(input_dir, output_dir, augmenter, augment_per_image, target_size=(224,224),
+                   save_prefix="", batch_size=32, num_threads=NUM_THREADS):
+    """Genera augment_per_image variantes de cada imagen de input_dir.
+
+    Las imágenes se leen en lotes con un pool de hilos (el siguiente lote se lee mientras
+    se procesa el actual), cada variante se calcula para el lote entero y los JPEG se
+    codifican y escriben en segundo plano. Los nombres son deterministas
+    (<prefijo><nombre>_<variante>.jpg), así que repetir la ejecución sobrescribe en vez de duplicar.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    files = sorted(f for f in os.listdir(input_dir) if f.lower().endswith(IMAGE_EXTS))
+    chunks = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    load = lambda f: load_rgb(os.path.join(input_dir, f), target_size)
+
+    start = time.perf_counter()
+    written, skipped = 0, 0
+    with ThreadPoolExecutor(max_workers=num_threads) as loader, \
+         ThreadPoolExecutor(max_workers=num_threads) as encoder:
+        pending_writes = []
+        next_chunk = loader.map(load, chunks[0]) if chunks else None
+        for i, chunk in enumerate(chunks):
+            loaded = list(next_chunk)
+            if i + 1 < len(chunks):
+                next_chunk = loader.map(load, chunks[i + 1])
+
+            names = [f for f, img in zip(chunk, loaded) if img is not None]
+            skipped += len(chunk) - len(names)
+            if not names:
+                continue
+            images = np.stack([img for img in loaded if img is not None])
+
+            # no acumular más de un lote de escrituras pendientes
+            for future in pending_writes:
+                written += bool(future.result())
+            pending_writes = []
+
+            for k in range(augment_per_image):
+                batch = augmenter.apply(images, names, [k] * len(names))
+                for name, img in zip(names, batch):
+                    out_path = os.path.join(output_dir, f"{save_prefix}{os.path.splitext(name)[0]}_{k}.jpg")
+                    pending_writes.append(encoder.submit(save_rgb, out_path, img))
+
+        for future in pending_writes:
+            written += bool(future.result())
+
+    elapsed = time.perf_counter() - start
+    print(f"⚡ {written} imágenes generadas en {elapsed:.1f}s "
+          f"({written / max(elapsed, 1e-9):.1f} img/s), {skipped} archivos ilegibles omitidos")
+    return written
@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modelos que se sirven en la app: .h5 entrenado + artefacto int8 de quantize.py (si existe)
+MODELS = {
+    "rcp": {
+        "h5": os.path.join(BASE_DIR, "rcp-model", "trained", "rcp_keypoints_model.h5"),
+        "int8": os.path.join(BASE_DIR, "rcp-model", "trained", "quantized", "rcp_keypoints_int8.tflite"),
+    },
+    "burn": {
+        "h5": os.path.join(BASE_DIR, "burn-skin-model", "burn_class_model_tfjs.h5"),
+        "int8": os.path.join(BASE_DIR, "burn-skin-model", "quantized", "burn_class_int8.tflite"),
+    },
+    "nose": {
+        "h5": os.path.join(BASE_DIR, "nose-model", "nose_detection_model.h5"),
+        "int8": os.path.join(BASE_DIR, "nose-model", "quantized", "nose_detection_int8.tflite"),
+    },
+}
+RUNTIMES = ("keras", "tflite", "tflite-int8", "onnx")
+BATCH_SIZES = (1, 8, 32)
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso (None si la plataforma no lo expone)"""
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024  # macOS: bytes, Linux: KB
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 1024 ** 2
+        except ImportError:
+            return None
+
+# ---------- Runtimes: cada uno devuelve una función predict(x) ----------
+def load_keras(path):
+    import tensorflow as tf
+    model = tf.keras.models.load_model(path, compile=False)
+    infer = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    return lambda x: infer(x).numpy(), list(model.input_shape[1:])
+
+def load_tflite(path):
+    try:
+        # intérprete suelto (lo que se usaría en producción): no carga TensorFlow entero
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    interpreter = Interpreter(model_path=path, num_threads=os.cpu_count())
+    inp = interpreter.get_input_details()[0]
+    out = interpreter.get_output_details()[0]
+    state = {"batch": None}
+
+    def predict(x):
+        if state["batch"] != len(x):
+            interpreter.resize_tensor_input(inp["index"], [len(x), *inp["shape"][1:]])
+            interpreter.allocate_tensors()
+            state["batch"] = len(x)
+        if inp["dtype"] != np.float32:
+            scale, zero_point = inp["quantization"]
+            info = np.iinfo(inp["dtype"])
+            x = np.clip(np.rint(x / scale + zero_point), info.min, info.max)
+        interpreter.set_tensor(inp["index"], x.astype(inp["dtype"]))
+        interpreter.invoke()
+        return interpreter.get_tensor(out["index"])
+    return predict, [int(d) for d in inp["shape"][1:]]
+
+def convert_tflite(spec, workdir):
+    import tensorflow as tf
+    model = tf.keras.models.load_model(spec["h5"], compile=False)
+    path = os.path.join(workdir, "model.tflite")
+    with open(path, "wb") as f:
+        f.write(tf.lite.TFLiteConverter.from_keras_model(model).convert())
+    return path
+
+def convert_onnx(spec, workdir):
+    import tensorflow as tf
+    import tf2onnx
+    model = tf.keras.models.load_model(spec["h5"], compile=False)
+    path = os.path.join(workdir, "model.onnx")
+    signature = [tf.TensorSpec([None, *model.input_shape[1:]], tf.float32, name="input")]
+    tf2onnx.convert.from_keras(model, input_signature=signature, opset=13, output_path=path)
+    return path
+
+def load_onnx(path):
+    import onnxruntime as ort
+    session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+    inp = session.get_inputs()[0]
+    return lambda x: session.run(None, {inp.name: x})[0], [int(d) for d in inp.shape[1:]]
+
+def import_runtime(runtime):
+    if runtime == "onnx":
+        import onnxruntime
+    elif runtime.startswith("tflite"):
+        try:
+            import tflite_runtime.interpreter
+        except ImportError:
+            import tensorflow
+    else:
+        import tensorflow
+
+def prepare_artifact(model_name, runtime, workdir):
+    """Convierte el .h5 al formato del runtime; se hace en otro proceso para no ensuciar
+    la carga en frío ni el RSS de la medición"""
+    spec = MODELS[model_name]
+    if runtime == "tflite":
+        return convert_tflite(spec, workdir)
+    if runtime == "onnx":
+        return convert_onnx(spec, workdir)
+    return spec["int8"] if runtime == "tflite-int8" else spec["h5"]
+
+# ---------- Un caso (modelo x runtime) en un proceso nuevo: carga en frío y RSS aislados ----------
+def run_case(model_name, runtime, artifact, batch_sizes, iters, seed=42):
+    # importar el runtime y cargar el artefacto se miden por separado (los dos son arranque en frío)
+    start = time.perf_counter()
+    import_runtime(runtime)
+    import_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    if runtime == "keras":
+        predict, shape = load_keras(artifact)
+    elif runtime == "onnx":
+        predict, shape = load_onnx(artifact)
+    else:
+        predict, shape = load_tflite(artifact)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(seed)
+    batches = {}
+    for batch_size in batch_sizes:
+        x = rng.random((batch_size, *shape), dtype=np.float32)
+        start = time.perf_counter()
+        predict(x)  # calentamiento: trazado del grafo / reserva de tensores
+        warmup_ms = (time.perf_counter() - start) * 1000
+        times = []
+        for _ in range(iters):
+            start = time.perf_counter()
+            predict(x)
+            times.append((time.perf_counter() - start) * 1000)
+        p50, p95, p99 = np.percentile(times, [50, 95, 99])
+        batches[str(batch_size)] = {
+            "warmup_ms": round(warmup_ms, 3),
+            "p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3),
+            "throughput_per_s": round(batch_size * iters / (sum(times) / 1000), 1),
+        }
+    return {
+        "model": model_name, "runtime": runtime,
+        "artifact": os.path.relpath(artifact, BASE_DIR) if artifact.startswith(BASE_DIR) else None,
+        "artifact_bytes": os.path.getsize(artifact),
+        "import_ms": round(import_ms, 3), "load_ms": round(load_ms, 3), "peak_rss_mb": peak_rss_mb(), "batches": batches,
+    }
+
+def unavailable_reason(model_name, runtime):
+    spec = MODELS[model_name]
+    if not os.path.exists(spec["h5"]):
+        return f"no existe {os.path.relpath(spec['h5'], BASE_DIR)}"
+    if runtime == "tflite-int8" and not os.path.exists(spec["int8"]):
+        return "sin artefacto int8 (ejecutar la exportación cuantizada)"
+    if runtime == "onnx":
+        try:
+            import onnxruntime, tf2onnx
+        except ImportError:
+            return "onnxruntime / tf2onnx no instalados"
+    return None
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import tensorflow as tf
+    return {
+        "commit": commit, "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(), "tensorflow": tf.__version__,
+        "machine": platform.machine(), "processor": platform.processor(), "cpu_count": os.cpu_count(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia y throughput de los modelos en CPU")
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--runtimes", nargs="+", default=list(RUNTIMES), choices=list(RUNTIMES))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=list(BATCH_SIZES))
+    parser.add_argument("--iters", type=int, default=100)
+    parser.add_argument("--out", default="benchmark.json")
+    args = parser.parse_args()
+
+    report = {"meta": metadata(), "iters": args.iters, "results": []}
+    for model_name in args.models:
+        for runtime in args.runtimes:
+            reason = unavailable_reason(model_name, runtime)
+            if reason:
+                print(f"⏭️ {model_name}/{runtime}: {reason}")
+                report["results"].append({"model": model_name, "runtime": runtime, "skipped": reason})
+                continue
+            with tempfile.TemporaryDirectory() as workdir:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                    artifact = executor.submit(prepare_artifact, model_name, runtime, workdir).result()
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                    result = executor.submit(run_case, model_name, runtime, artifact,
+                                             args.batch_sizes, args.iters).result()
+            report["results"].append(result)
+            summary = ", ".join(f"b{b}: p50 {r['p50_ms']:.2f} ms ({r['throughput_per_s']:.0f}/s)"
+                                for b, r in result["batches"].items())
+            print(f"⏱️ {model_name}/{runtime}: import {result['import_ms']:.0f} ms + carga {result['load_ms']:.0f} ms, "
+                  f"RSS {result['peak_rss_mb'] or 0:.0f} MB — {summary}")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Resultados en {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 import os
-from tensorflow.keras.preprocessing.image import ImageDataGenerator, img_to_array, load_img, array_to_img, save_img
+import sys
+# augment.py es común a los tres modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from augment import BatchAugmenter, augment_folder
+
+# Opcional: trainmodel.py puede aumentar al vuelo (AUGMENT_ON_THE_FLY) sin pasar por disco.
+# Este script queda para exportar las imágenes aumentadas, p. ej. para revisarlas.
 
 # Carpetas
 input_dir = r"C:\Users\estro\Desktop\rcp-model/treain-skin-bourn/quemadas"  # tus imágenes originales
 output_dir = r"C:\Users\estro\Desktop\rcp-model/treain-skin-bourn/quemadas_aug"  # carpeta donde se guardarán las aumentadas
 
-os.makedirs(output_dir, exist_ok=True)
-
 # Configuración del aumento de datos
-datagen = ImageDataGenerator(
+augmenter = BatchAugmenter(
     rotation_range=30,      # rotación aleatoria de hasta 30 grados
     width_shift_range=0.1,  # desplazamiento horizontal
     height_shift_range=0.1, # desplazamiento vertical
@@ -16,22 +20,13 @@ datagen = ImageDataGenerator(
     zoom_range=0.2,         # zoom aleatorio
     horizontal_flip=True,   # volteo horizontal
     brightness_range=[0.7, 1.3], # brillo aleatorio
-    fill_mode='nearest'
+    seed=42                 # misma semilla -> mismas imágenes aumentadas
 )
 
 # Cuántas imágenes quieres generar por original
 augment_per_image = 3
 
-for img_file in os.listdir(input_dir):
-    img_path = os.path.join(input_dir, img_file)
-    img = load_img(img_path)  # carga imagen
-    x = img_to_array(img)     # pasa a array
-    x = x.reshape((1,) + x.shape)
-
-    i = 0
-    for batch in datagen.flow(x, batch_size=1, save_to_dir=output_dir, save_prefix='aug', save_format='jpg'):
-        i += 1
-        if i >= augment_per_image:
-            break
+# Se guardan a 224x224, el tamaño con el que entrena el modelo
+augment_folder(input_dir, output_dir, augmenter, augment_per_image, target_size=(224, 224), save_prefix="aug_")
 
 print("✅ Aumento de datos completado")
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import numpy as np
+import tensorflow as tf
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2_as_graph
+# dataset.py, cache.py y finetune.py son comunes a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset import list_dataset, make_dataset, model_normalizes_input
+from cache import ImageCache
+from finetune import saved_split
+
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# El modelo entrenado (MobileNetV2 1.0 + cabeza 128) hace de profesor de un alumno mucho más pequeño
+TEACHER_PATH = "burn_class_model_tfjs.h5"  # el .h5 que guarda trainmodel.py (MODEL_PATH)
+STUDENT_PATH = "burn_class_student.h5"
+# "mobilenetv2_035" (MobileNetV2 alpha=0.35, pesos ImageNet) o "tiny_cnn" (desde cero)
+STUDENT = "mobilenetv2_035"
+TEMPERATURE = 4.0  # suaviza las probabilidades del profesor
+ALPHA = 0.3        # peso de la etiqueta real frente a la del profesor
+EPOCHS = 15
+BATCH_SIZE = 32
+
+# ---------- Rutas de dataset (las mismas que trainmodel.py) ----------
+burned_dir = "C:/Users/estro/Desktop/rcp-model/treain-skin-bourn/quemadas"
+healthy_dir = "C:/Users/estro/Desktop/rcp-model/treain-skin-bourn/sanas"
+
+# ---------- Alumnos ----------
+def build_student(kind, rescale, img_size=(224,224)):
+    """Devuelve (modelo con salida en logits, modelo final con sigmoid). rescale: entrada uint8 0-255
+    con Rescaling en el grafo; si no, entrada 0-1 (Technique.tsx divide entre 255 antes de predict())"""
+    inputs = tf.keras.Input(shape=(*img_size, 3))
+    x = tf.keras.layers.Rescaling(1./255)(inputs) if rescale else inputs
+    if kind == "mobilenetv2_035":
+        backbone = tf.keras.applications.MobileNetV2(
+            input_shape=(*img_size, 3), include_top=False, weights='imagenet', alpha=0.35
+        )
+        x = backbone(x)
+    elif kind == "tiny_cnn":
+        x = tf.keras.layers.Conv2D(16, 3, strides=2, padding='same', use_bias=False)(x)
+        x = tf.keras.layers.BatchNormalization()(x)
+        x = tf.keras.layers.ReLU(6.)(x)
+        for filters in (32, 64, 128, 128):
+            x = tf.keras.layers.SeparableConv2D(filters, 3, strides=2, padding='same', use_bias=False)(x)
+            x = tf.keras.layers.BatchNormalization()(x)
+            x = tf.keras.layers.ReLU(6.)(x)
+    else:
+        raise ValueError(f"Alumno desconocido: {kind}")
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    x = tf.keras.layers.Dropout(0.2)(x)
+    logits = tf.keras.layers.Dense(1)(x)
+    outputs = tf.keras.layers.Activation('sigmoid')(logits)
+    return tf.keras.Model(inputs, logits), tf.keras.Model(inputs, outputs)
+
+# ---------- Pérdida de destilación ----------
+def to_logits(p, eps=1e-6):
+    p = tf.clip_by_value(p, eps, 1 - eps)
+    return tf.math.log(p / (1 - p))
+
+def distillation_loss(y_true, logits):
+    """y_true = [etiqueta real, probabilidad del profesor]; el alumno entrega logits"""
+    hard, teacher_p = y_true[:, :1], y_true[:, 1:]
+    hard_loss = tf.nn.sigmoid_cross_entropy_with_logits(labels=hard, logits=logits)
+    soft_targets = tf.sigmoid(to_logits(teacher_p) / TEMPERATURE)
+    soft_loss = tf.nn.sigmoid_cross_entropy_with_logits(labels=soft_targets, logits=logits / TEMPERATURE)
+    # T^2 mantiene la escala de los gradientes de la parte suave al subir la temperatura
+    return tf.reduce_mean(ALPHA * hard_loss + (1 - ALPHA) * TEMPERATURE ** 2 * soft_loss)
+
+def hard_accuracy(y_true, logits):
+    return tf.reduce_mean(tf.cast(tf.equal(y_true[:, :1] > 0.5, logits > 0), tf.float32))
+
+# ---------- Métricas del informe ----------
+def count_flops(model):
+    """FLOPs de una inferencia (batch 1), contados por el profiler sobre el grafo congelado"""
+    spec = tf.TensorSpec([1, *model.input_shape[1:]], tf.float32)
+    concrete = tf.function(lambda x: model(x, training=False)).get_concrete_function(spec)
+    _, graph_def = convert_variables_to_constants_v2_as_graph(concrete)
+    with tf.Graph().as_default() as graph:
+        tf.graph_util.import_graph_def(graph_def, name="")
+        options = tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+        options["output"] = "none"
+        return tf.compat.v1.profiler.profile(graph=graph, options=options).total_float_ops
+
+def latency_ms(model, runs=50):
+    infer = tf.function(lambda x: model(x, training=False))
+    x = tf.zeros([1, *model.input_shape[1:]])
+    infer(x)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        infer(x).numpy()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+def predict_scores(model, paths, cache):
+    """Probabilidades en el orden de `paths` (None para imágenes ilegibles)"""
+    normalize = not model_normalizes_input(model)
+    ds = make_dataset(paths, list(range(len(paths))), batch_size=BATCH_SIZE, cache=cache, normalize=normalize)
+    infer = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    scores = [None] * len(paths)
+    for imgs, idx in ds:
+        for i, s in zip(idx.numpy(), infer(imgs).numpy().reshape(-1)):
+            scores[i] = float(s)
+    return scores
+
+if __name__ == "__main__":
+    paths, labels = list_dataset({burned_dir: 1, healthy_dir: 0})
+    cache = ImageCache(CACHE_DIR)
+    cache.update(paths)
+    # partición del profesor: el test de la comparación son imágenes que ninguno de los dos vio
+    (p_train, y_train), (p_val, y_val), (p_test, y_test) = saved_split(TEACHER_PATH, cache, paths, labels)
+
+    # ---------- Etiquetas suaves del profesor (una sola pasada, sin aumento) ----------
+    teacher = tf.keras.models.load_model(TEACHER_PATH, compile=False)
+    print("👩‍🏫 Calculando predicciones del profesor")
+
+    def with_teacher(p, y):
+        scores = predict_scores(teacher, p, cache)
+        keep = [i for i, s in enumerate(scores) if s is not None]
+        return [p[i] for i in keep], [[float(y[i]), scores[i]] for i in keep]
+
+    p_train_t, t_train = with_teacher(p_train, y_train)
+    p_val_t, t_val = with_teacher(p_val, y_val)
+
+    # ---------- Entrenar al alumno ----------
+    # misma entrada que el profesor: el alumno sustituye al modelo publicado sin tocar la app
+    rescale = model_normalizes_input(teacher)
+    student_logits, student = build_student(STUDENT, rescale)
+    student_logits.compile(optimizer=tf.keras.optimizers.Adam(1e-3), loss=distillation_loss, metrics=[hard_accuracy])
+    train_ds = make_dataset(p_train_t, t_train, batch_size=BATCH_SIZE, shuffle=True, cache=cache, normalize=not rescale)
+    val_ds = make_dataset(p_val_t, t_val, batch_size=BATCH_SIZE, cache=cache, normalize=not rescale)
+    student_logits.fit(train_ds, validation_data=val_ds, epochs=EPOCHS)
+
+    student.save(STUDENT_PATH)
+    print(f"💾 Alumno guardado en {STUDENT_PATH}")
+
+    # ---------- Informe: accuracy vs parámetros, FLOPs y latencia ----------
+    teacher_test = predict_scores(teacher, p_test, cache)
+    student_test = predict_scores(student, p_test, cache)
+    rows = []
+    for name, model, scores in (("profesor", teacher, teacher_test), (f"alumno ({STUDENT})", student, student_test)):
+        pairs = [(s, y) for s, y in zip(scores, y_test) if s is not None]
+        acc = np.mean([(s > 0.5) == y for s, y in pairs])
+        rows.append((name, model.count_params(), count_flops(model), latency_ms(model), acc))
+    agreement = np.mean([(a > 0.5) == (b > 0.5) for a, b in zip(teacher_test, student_test) if a is not None])
+
+    print(f"\n📊 Destilación sobre {len(p_test)} imágenes de test (coincidencia alumno/profesor: {agreement*100:.1f}%)")
+    print(f"{'modelo':<26}{'parámetros':>12}{'GFLOPs':>9}{'CPU batch 1':>13}{'accuracy':>10}")
+    for name, params, flops, lat, acc in rows:
+        print(f"{name:<26}{params:>12,}{flops / 1e9:>9.3f}{lat:>10.2f} ms{acc*100:>9.2f}%")
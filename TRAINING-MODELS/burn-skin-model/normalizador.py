@@ -1,20 +1,21 @@
 import os
-import cv2
+import sys
 import numpy as np
+# cache.py es común a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache import ImageCache
 
-def load_images(folder_path, label, img_size=(224,224)):
-    images = []
-    labels = []
-    for filename in os.listdir(folder_path):
-        path = os.path.join(folder_path, filename)
-        img = cv2.imread(path)
-        if img is None:
-            continue
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, img_size)
-        images.append(img / 255.0)  # Normalizar
-        labels.append(label)
-    return np.array(images), np.array(labels)
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+cache = ImageCache(CACHE_DIR)
+
+def load_images(folder_path, label):
+    # decodificadas una sola vez y guardadas en .cache/ (ver cache.py)
+    paths = [os.path.join(folder_path, f) for f in os.listdir(folder_path)]
+    keys = [k for k in cache.update(paths) if k is not None]
+    images = cache.gather(keys)  # uint8: normalizar dentro del modelo (capa Rescaling)
+    return images, np.full(len(keys), label)
 
 burned_dir = r"C:\Users\estro\Desktop\rcp-model\treain-skin-bourn/quemadas"
 healthy_dir = r"C:\Users\estro\Desktop\rcp-model\treain-skin-bourn/sanas"
@@ -1,45 +1,123 @@
 import os
-import cv2
+import sys
+import csv
+import json
+import time
+import argparse
 import numpy as np
 import tensorflow as tf
+from sklearn.metrics import confusion_matrix
+# cache.py y dataset.py son comunes a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache import ImageCache
+from dataset import list_images, make_dataset, model_normalizes_input
 
-# Cargar modelo entrenado
-model = tf.keras.models.load_model("burn_class_model.h5")
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
 
-# Función para cargar y preprocesar imagen
-def load_and_preprocess(img_path, img_size=(224,224)):
-    img = cv2.imread(img_path)
-    if img is None:
-        return None
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    img = cv2.resize(img, img_size)
-    img = img / 255.0
-    return np.expand_dims(img, axis=0)
-
-# Directorios de prueba (elige algunas imágenes aleatorias)
+# Directorios de prueba por defecto (si no se pasa --dir ni --manifest)
 burned_dir = r"C:\Users\estro\Desktop\rcp-model\treain-skin-bourn/quemadas"
 healthy_dir = r"C:\Users\estro\Desktop\rcp-model\treain-skin-bourn/sanas"
 
-# Tomar algunas imágenes aleatorias
-burned_imgs = np.random.choice(os.listdir(burned_dir), 5, replace=False)
-healthy_imgs = np.random.choice(os.listdir(healthy_dir), 5, replace=False)
-
-print("🔴 Probando imágenes quemadas:")
-for img_name in burned_imgs:
-    img_path = os.path.join(burned_dir, img_name)
-    img = load_and_preprocess(img_path)
-    if img is None:
-        continue
-    pred = model.predict(img)[0][0]
-    label = "Quemada" if pred > 0.5 else "Sana"
-    print(f"{img_name}: {label} ({pred:.2f})")
-
-print("\n🟢 Probando imágenes sanas:")
-for img_name in healthy_imgs:
-    img_path = os.path.join(healthy_dir, img_name)
-    img = load_and_preprocess(img_path)
-    if img is None:
-        continue
-    pred = model.predict(img)[0][0]
-    label = "Quemada" if pred > 0.5 else "Sana"
-    print(f"{img_name}: {label} ({pred:.2f})")
+CLASS_NAMES = {0: "Sana", 1: "Quemada"}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Evalúa el modelo de quemaduras sobre carpetas completas, por lotes")
+    parser.add_argument("--model", default="burn_class_model_tfjs.h5")
+    parser.add_argument("--dir", action="append", default=[], metavar="CARPETA[=ETIQUETA]",
+                        help="carpeta a evaluar; con =1 / =0 se usa para la matriz de confusión (repetible)")
+    parser.add_argument("--manifest", help="CSV con columnas path[,label] (label vacío = sin etiqueta)")
+    parser.add_argument("--out", default="scores.csv", help="resultados por archivo: .csv o .jsonl")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--sample", type=int, help="evaluar solo N imágenes aleatorias de cada carpeta")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="decodificar con tf.data en vez de pasar por .cache/ (no escribe nada a disco)")
+    return parser.parse_args()
+
+# ---------- Qué evaluar: (ruta, etiqueta o None) ----------
+def collect_inputs(args):
+    items = []
+    if args.manifest:
+        with open(args.manifest, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                label = row.get("label")
+                items.append((row["path"], int(label) if label not in (None, "") else None))
+    dirs = args.dir
+    if not dirs and not args.manifest:
+        dirs = [f"{burned_dir}=1", f"{healthy_dir}=0"]
+    for spec in dirs:
+        folder, _, label = spec.partition("=")
+        paths, _ = list_images(folder, None)
+        if args.sample:
+            paths = sorted(np.random.choice(paths, min(args.sample, len(paths)), replace=False))
+        items += [(p, int(label) if label else None) for p in paths]
+    return items
+
+def write_results(path, rows):
+    if path.endswith(".jsonl"):
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["path", "label", "score", "pred", "class"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+def main():
+    args = parse_args()
+
+    # Cargar modelo entrenado
+    model = tf.keras.models.load_model(args.model)
+    # Modelos exportados con Rescaling reciben uint8 directamente
+    normalize = not model_normalizes_input(model)
+    # una sola traza del grafo: sin el coste de preparar model.predict en cada llamada
+    infer = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+
+    items = collect_inputs(args)
+    paths = [p for p, _ in items]
+    print(f"🔎 {len(paths)} imágenes a evaluar con {args.model}")
+
+    # la "etiqueta" del dataset es el índice de la fila: así se sabe qué archivo es cada
+    # predicción aunque se salten archivos ilegibles
+    cache = None if args.no_cache else ImageCache(CACHE_DIR)
+    if cache is not None:
+        cache.update(paths)
+    ds = make_dataset(paths, list(range(len(paths))), batch_size=args.batch_size,
+                      cache=cache, normalize=normalize)
+
+    start = time.perf_counter()
+    indices, scores = [], []
+    for imgs, idx in ds:
+        scores.append(infer(imgs).numpy().reshape(-1))
+        indices.append(idx.numpy())
+    elapsed = time.perf_counter() - start
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype=int)
+    scores = np.concatenate(scores) if scores else np.zeros(0)
+
+    rows = []
+    for i, score in zip(indices, scores):
+        path, label = items[i]
+        pred = int(score > args.threshold)
+        rows.append({"path": path, "label": label, "score": round(float(score), 6),
+                     "pred": pred, "class": CLASS_NAMES[pred]})
+    write_results(args.out, rows)
+
+    print(f"💾 {len(rows)} resultados en {args.out} ({len(paths) - len(rows)} archivos ilegibles omitidos)")
+    print(f"⚡ {len(rows) / max(elapsed, 1e-9):.1f} img/s (batch {args.batch_size})")
+
+    labelled = [r for r in rows if r["label"] is not None]
+    if labelled:
+        y_true = [r["label"] for r in labelled]
+        y_pred = [r["pred"] for r in labelled]
+        cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
+        acc = np.trace(cm) / cm.sum()
+        print(f"\n📊 Matriz de confusión (filas = real, columnas = predicho), umbral {args.threshold}")
+        print(f"{'':>10}{CLASS_NAMES[0]:>10}{CLASS_NAMES[1]:>10}")
+        for label, counts in zip([0, 1], cm):
+            print(f"{CLASS_NAMES[label]:>10}{counts[0]:>10}{counts[1]:>10}")
+        print(f"🎯 Accuracy: {acc*100:.2f}% sobre {len(labelled)} imágenes etiquetadas")
+
+if __name__ == "__main__":
+    main()
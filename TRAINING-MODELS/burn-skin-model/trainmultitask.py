@@ -0,0 +1,165 @@
+import os
+import sys
+import numpy as np
+import tensorflow as tf
+from sklearn.utils.class_weight import compute_class_weight
+# dataset.py, cache.py y embeddings.py son comunes a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset import list_dataset, split_paths, make_dataset
+from cache import ImageCache
+from embeddings import EmbeddingCache, build_extractor
+
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# Un solo MobileNetV2 con dos cabezas (quemadura y nariz): un artefacto y una pasada por frame
+MODEL_PATH = "multitask_model.h5"
+USE_EMBEDDINGS = True  # backbone congelado: la cabeza entrena sobre embeddings cacheados
+# Como en cada trainmodel.py: desactivado mientras Technique.tsx divida entre 255 antes de predict()
+NORMALIZE_IN_MODEL = False
+EPOCHS = 15
+BATCH_SIZE = 32
+MISSING = -1  # la imagen no tiene etiqueta para esa tarea
+
+# ---------- Rutas de dataset (las de burn-skin-model y nose-model) ----------
+burned_dir = "C:/Users/estro/Desktop/rcp-model/treain-skin-bourn/quemadas"
+healthy_skin_dir = "C:/Users/estro/Desktop/rcp-model/treain-skin-bourn/sanas"
+blood_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sangre"
+healthy_nose_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sana"
+
+TASKS = ("burn", "nose")
+
+def with_task(split, task):
+    """(rutas, etiquetas) de una tarea -> (rutas, [burn, nose]) con MISSING en la otra"""
+    paths, labels = split
+    return paths, [[l if t == task else MISSING for t in TASKS] for l in labels]
+
+def merge(*splits):
+    paths, labels = [], []
+    for p, l in splits:
+        paths += p
+        labels += l
+    return paths, labels
+
+# Mismos splits (y semilla) que cada trainmodel.py, así el test de cada tarea es el de siempre
+burn_train, burn_val, burn_test = split_paths(*list_dataset({burned_dir: 1, healthy_skin_dir: 0}))
+nose_train, nose_val, nose_test = split_paths(*list_dataset({blood_dir: 1, healthy_nose_dir: 0}))
+p_train, y_train = merge(with_task(burn_train, "burn"), with_task(nose_train, "nose"))
+p_val, y_val = merge(with_task(burn_val, "burn"), with_task(nose_val, "nose"))
+p_test, y_test = merge(with_task(burn_test, "burn"), with_task(nose_test, "nose"))
+
+cache = ImageCache(CACHE_DIR)
+cache.update(p_train + p_val + p_test)
+normalize = not NORMALIZE_IN_MODEL
+
+# ---------- Pesos por muestra: 0 donde falta la etiqueta (pérdida enmascarada) ----------
+# nariz: clases balanceadas como en nose-model/trainmodel.py; quemaduras: sin balancear
+nose_labels = np.array(nose_train[1])
+nose_class_weights = dict(zip(
+    np.unique(nose_labels),
+    compute_class_weight("balanced", classes=np.unique(nose_labels), y=nose_labels),
+))
+class_weights = {"burn": {0: 1.0, 1: 1.0}, "nose": nose_class_weights}
+
+def targets(y):
+    """y (n, 2) -> etiquetas y pesos por salida"""
+    y = np.asarray(y)
+    labels, weights = {}, {}
+    for i, task in enumerate(TASKS):
+        present = y[:, i] != MISSING
+        labels[task] = np.where(present, y[:, i], 0).astype(np.float32)
+        weights[task] = np.where(present, [class_weights[task].get(v, 1.0) for v in y[:, i]], 0.0).astype(np.float32)
+    return labels, weights
+
+def split_targets(imgs, y):
+    """Lotes de make_dataset (y = [burn, nose]) -> (imágenes, etiquetas, pesos) por salida"""
+    labels, weights = {}, {}
+    for i, task in enumerate(TASKS):
+        col = tf.cast(y[:, i], tf.float32)
+        present = tf.cast(col != MISSING, tf.float32)
+        cw = class_weights[task]
+        labels[task] = col * present
+        weights[task] = present * tf.where(col > 0.5, float(cw.get(1, 1.0)), float(cw.get(0, 1.0)))
+    return imgs, labels, weights
+
+# ---------- Modelo ----------
+base_model = tf.keras.applications.MobileNetV2(
+    input_shape=(224,224,3), include_top=False, weights='imagenet'
+)
+base_model.trainable = False
+
+# cabezas iguales a las de cada trainmodel.py
+heads = {
+    "burn": [tf.keras.layers.Dense(128, activation='relu'),
+             tf.keras.layers.Dense(1, activation='sigmoid')],
+    "nose": [tf.keras.layers.Dense(128, activation='relu'),
+             tf.keras.layers.Dropout(0.3),
+             tf.keras.layers.Dense(1, activation='sigmoid')],
+}
+
+def attach_heads(features):
+    outputs = {}
+    for task, layers in heads.items():
+        x = features
+        for layer in layers:
+            x = layer(x)
+        # nombre de la salida = nombre de la tarea (claves de etiquetas y pesos)
+        outputs[task] = tf.keras.layers.Reshape((1,), name=task)(x)
+    return outputs
+
+# Con NORMALIZE_IN_MODEL la entrada son píxeles 0-255 y se escala dentro del grafo
+inputs = tf.keras.Input(shape=(224,224,3))
+x = tf.keras.layers.Rescaling(1./255)(inputs) if NORMALIZE_IN_MODEL else inputs
+x = base_model(x)
+features = tf.keras.layers.GlobalAveragePooling2D()(x)
+model = tf.keras.Model(inputs, attach_heads(features))
+
+losses = {task: 'binary_crossentropy' for task in TASKS}
+metrics = {task: ['accuracy'] for task in TASKS}
+model.compile(optimizer='adam', loss=losses, weighted_metrics=metrics)
+
+# ---------- Entrenar ----------
+if USE_EMBEDDINGS:
+    emb_cache = EmbeddingCache(CACHE_DIR)
+    emb_cache.update(cache, p_train + p_val + p_test, build_extractor(base_model))
+    X_train, Y_train = emb_cache.load(cache, p_train, y_train)
+    X_val, Y_val = emb_cache.load(cache, p_val, y_val)
+
+    # mismas capas (mismos pesos) que las cabezas de `model`
+    emb_inputs = tf.keras.Input(shape=(X_train.shape[1],))
+    head_model = tf.keras.Model(emb_inputs, attach_heads(emb_inputs))
+    head_model.compile(optimizer='adam', loss=losses, weighted_metrics=metrics)
+    train_labels, train_weights = targets(Y_train)
+    val_labels, val_weights = targets(Y_val)
+    history = head_model.fit(
+        X_train, train_labels, sample_weight=train_weights,
+        validation_data=(X_val, val_labels, val_weights),
+        epochs=EPOCHS, batch_size=BATCH_SIZE,
+    )
+else:
+    train_ds = make_dataset(p_train, y_train, batch_size=BATCH_SIZE, shuffle=True, cache=cache, normalize=normalize)
+    val_ds = make_dataset(p_val, y_val, batch_size=BATCH_SIZE, cache=cache, normalize=normalize)
+    history = model.fit(train_ds.map(split_targets), validation_data=val_ds.map(split_targets), epochs=EPOCHS)
+
+# ---------- Guardar ----------
+model.save(MODEL_PATH)
+# dos modelos por separado = dos copias del backbone + las mismas cabezas
+separate = 2 * base_model.count_params() + sum(l.count_params() for layers in heads.values() for l in layers)
+print(f"💾 Guardado en {MODEL_PATH}: {model.count_params():,} parámetros frente a {separate:,} "
+      f"de burn + nose por separado ({model.count_params() / separate * 100:.0f}%), una sola pasada para las dos tareas")
+print(f"tensorflowjs_converter --input_format=keras {MODEL_PATH} multitask_model_web")
+
+# ---------- Evaluar cada tarea en su test ----------
+test_ds = make_dataset(p_test, y_test, batch_size=BATCH_SIZE, cache=cache, normalize=normalize)
+preds, labels = {task: [] for task in TASKS}, []
+for imgs, y in test_ds:
+    out = model(imgs, training=False)
+    for task in TASKS:
+        preds[task].append(out[task].numpy().reshape(-1))
+    labels.append(y.numpy())
+labels = np.concatenate(labels)
+for i, task in enumerate(TASKS):
+    present = labels[:, i] != MISSING
+    scores = np.concatenate(preds[task])[present]
+    acc = np.mean((scores > 0.5) == labels[present, i])
+    print(f"🎯 {task}: Test Accuracy {acc*100:.2f}% ({present.sum()} imágenes)")
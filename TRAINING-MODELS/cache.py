@@ -0,0 +1,149 @@
+import os
+import json
+import hashlib
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+SHARD_SIZE = 1024  # imágenes por shard (~150 MB a 224x224 RGB uint8)
+NUM_THREADS = os.cpu_count() or 4
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def decode_resize(path, img_size=(224,224)):
+    img = cv2.imread(path)
+    if img is None:
+        return None
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    return cv2.resize(img, img_size)
+
+class ImageCache:
+    """Imágenes ya decodificadas (RGB uint8) guardadas en shards .npy mapeados en memoria.
+
+    index.json guarda dos tablas:
+      files:   ruta -> tamaño, mtime y sha1 del contenido
+      entries: sha1 -> [shard, fila]  (None si el archivo no se pudo decodificar)
+    Solo se vuelve a decodificar lo que cambió de contenido; el resto se lee del mmap.
+    cache_dir: la .cache de cada modelo (junto a su trainmodel.py, ignorada por git).
+    """
+
+    def __init__(self, cache_dir, img_size=(224,224), readonly=False):
+        self.img_size = tuple(img_size)
+        self.dir = os.path.join(cache_dir, f"images_{self.img_size[0]}x{self.img_size[1]}")
+        self.index_path = os.path.join(self.dir, "index.json")
+        # readonly: lo que falte se decodifica solo en memoria y no se escribe nada
+        self.readonly = readonly
+        self.files, self.entries, self.shards = {}, {}, []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            self.files, self.entries, self.shards = index["files"], index["entries"], index["shards"]
+        self._mmaps = {}
+
+    # ---------- Claves: ruta + mtime -> hash de contenido ----------
+    def _file_key(self, path):
+        st = os.stat(path)
+        info = self.files.get(path)
+        if info and info["size"] == st.st_size and info["mtime"] == st.st_mtime_ns:
+            return path, info
+        return path, {"size": st.st_size, "mtime": st.st_mtime_ns, "sha1": file_hash(path)}
+
+    def update(self, paths):
+        """Asegura que todas las rutas estén en caché y devuelve su clave (None = ilegible)"""
+        paths = [os.path.abspath(p) for p in paths]
+        with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+            infos = list(executor.map(self._file_key, paths))
+        changed = False
+        missing = {}
+        for path, info in infos:
+            if self.files.get(path) != info:
+                self.files[path] = info
+                changed = True
+            if info["sha1"] not in self.entries:
+                missing.setdefault(info["sha1"], path)
+        if missing:
+            print(f"🧩 Decodificando {len(missing)} imágenes nuevas o modificadas")
+            self._add(missing)
+        elif paths:
+            print(f"⚡ {len(paths)} imágenes servidas desde la caché")
+        if (changed or missing) and not self.readonly:
+            self._save_index()
+        return self.lookup(paths)
+
+    def hashes(self, paths):
+        """sha1 del contenido de cada ruta sin decodificar nada (se reutiliza el índice si no cambió)"""
+        paths = [os.path.abspath(p) for p in paths]
+        with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+            return [info["sha1"] for _, info in executor.map(self._file_key, paths)]
+
+    def lookup(self, paths):
+        keys = []
+        for p in paths:
+            info = self.files.get(os.path.abspath(p))
+            sha1 = info["sha1"] if info else None
+            keys.append(sha1 if self.entries.get(sha1) is not None else None)
+        return keys
+
+    # ---------- Escritura de shards ----------
+    def _add(self, missing):
+        items = list(missing.items())
+        for start in range(0, len(items), SHARD_SIZE):
+            chunk = items[start:start + SHARD_SIZE]
+            with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+                imgs = list(executor.map(lambda kv: decode_resize(kv[1], self.img_size), chunk))
+            ok = [(sha1, img) for (sha1, path), img in zip(chunk, imgs) if img is not None]
+            for (sha1, path), img in zip(chunk, imgs):
+                if img is None:
+                    print(f"⚠️ {os.path.basename(path)} no cargada")
+                    self.entries[sha1] = None
+            if not ok:
+                continue
+            shard = f"shard_{len(self.shards):05d}.npy"
+            if self.readonly:
+                self._mmaps[shard] = np.stack([img for _, img in ok])
+            else:
+                self._write_shard(shard, [img for _, img in ok])
+            self.shards.append(shard)
+            for row, (sha1, _) in enumerate(ok):
+                self.entries[sha1] = [shard, row]
+
+    def _write_shard(self, shard, imgs):
+        os.makedirs(self.dir, exist_ok=True)
+        path = os.path.join(self.dir, shard)
+        w, h = self.img_size
+        arr = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=np.uint8, shape=(len(imgs), h, w, 3))
+        for i, img in enumerate(imgs):
+            arr[i] = img
+        arr.flush()
+        del arr
+        os.replace(path + ".tmp", path)
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files, "entries": self.entries, "shards": self.shards}, f)
+        os.replace(tmp, self.index_path)
+
+    # ---------- Lectura (sin copiar el shard completo) ----------
+    def shard(self, name):
+        if name not in self._mmaps:
+            self._mmaps[name] = np.load(os.path.join(self.dir, name), mmap_mode="r")
+        return self._mmaps[name]
+
+    def open_all(self):
+        # abrir los mmaps antes de leer desde varios hilos de tf.data
+        for name in self.shards:
+            self.shard(name)
+
+    def gather(self, keys):
+        w, h = self.img_size
+        out = np.empty((len(keys), h, w, 3), dtype=np.uint8)
+        for i, sha1 in enumerate(keys):
+            shard, row = self.entries[sha1]
+            out[i] = self.shard(shard)[row]
+        return out
@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Arrays de cada tarea (keypoints o embeddings) escritos una vez y leídos con mmap por todos los folds
+SHARED_DIR = os.path.join(BASE_DIR, ".cache", "crossval")
+
+# Mismos datos, modelos y épocas que cada trainer
+TASKS = {
+    "rcp": {
+        "dir": os.path.join(BASE_DIR, "rcp-model"),
+        "npy": r"C:\Users\estro\Desktop\rcp-model\keypoints_npy",
+        "csv": r"C:\Users\estro\Desktop\rcp-model\keypoints.csv",
+    },
+    "burn": {
+        "dir": os.path.join(BASE_DIR, "burn-skin-model"),
+        "folders": {"C:/Users/estro/Desktop/rcp-model/treain-skin-bourn/quemadas": 1,
+                    "C:/Users/estro/Desktop/rcp-model/treain-skin-bourn/sanas": 0},
+        "dropout": None, "balanced": False,
+    },
+    "nose": {
+        "dir": os.path.join(BASE_DIR, "nose-model"),
+        "folders": {"C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sangre": 1,
+                    "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sana": 0},
+        "dropout": 0.3, "balanced": True,
+    },
+}
+K_FOLDS = 5
+SEED = 42
+NUM_WORKERS = min(K_FOLDS, os.cpu_count() or 1)
+HEAD_EPOCHS = 15  # burn / nose: cabeza Dense sobre los embeddings, como con USE_EMBEDDINGS
+
+# ---------- Preparar los arrays compartidos (un proceso nuevo por tarea) ----------
+# Cada tarea prepara sus datos en su propio intérprete: ni TF ni las cachés ni los módulos de su
+# carpeta se quedan cargados en el proceso principal para la tarea siguiente
+def prepare_keypoints(spec, features):
+    sys.path.insert(0, spec["dir"])
+    from keypoints_io import load_keypoints
+    from pose_features import pose_features
+    X, y = load_keypoints(spec["npy"], spec["csv"])
+    return (pose_features(X) if features == "pose" else X), y
+
+def prepare_embeddings(spec):
+    """Embeddings del MobileNetV2 congelado desde la caché de la carpeta de la tarea
+    (solo se calculan los que falten, igual que en trainmodel.py)"""
+    import tensorflow as tf
+    from dataset import list_dataset
+    from cache import ImageCache
+    from embeddings import EmbeddingCache, build_extractor
+    cache_dir = os.path.join(spec["dir"], ".cache")
+    paths, labels = list_dataset(spec["folders"])
+    cache = ImageCache(cache_dir)
+    cache.update(paths)
+    emb_cache = EmbeddingCache(cache_dir)
+    base_model = tf.keras.applications.MobileNetV2(
+        input_shape=(224,224,3), include_top=False, weights='imagenet'
+    )
+    emb_cache.update(cache, paths, build_extractor(base_model))
+    return emb_cache.load(cache, paths, labels)
+
+def write_shared(task, X, y):
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    paths = {}
+    for name, arr in (("X", np.asarray(X, dtype=np.float32)), ("y", np.asarray(y, dtype=np.int32))):
+        paths[name] = os.path.join(SHARED_DIR, f"{task}_{name}.npy")
+        with open(paths[name] + ".tmp", "wb") as f:
+            np.save(f, arr)
+        os.replace(paths[name] + ".tmp", paths[name])
+    return paths["X"], paths["y"]
+
+def prepare_shared(task, features):
+    start = time.perf_counter()
+    X, y = prepare_keypoints(TASKS[task], features) if task == "rcp" else prepare_embeddings(TASKS[task])
+    x_path, y_path = write_shared(task, X, y)
+    return x_path, y_path, len(y), X.shape[1], time.perf_counter() - start
+
+# ---------- Worker: un fold ----------
+def init_worker(threads):
+    # OMP_NUM_THREADS ya viene en el entorno del proceso (ver crossval): aquí numpy ya está importado
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def run_fold(task, fold, x_path, y_path, train_idx, test_idx, features):
+    import tensorflow as tf
+    from sklearn.utils.class_weight import compute_class_weight
+    tf.keras.utils.set_random_seed(SEED + fold)
+    start = time.perf_counter()
+    # mmap: solo se leen (y se copian) las filas de este fold
+    X, y = np.load(x_path, mmap_mode="r"), np.load(y_path, mmap_mode="r")
+    X_train, y_train, X_test, y_test = X[train_idx], y[train_idx], X[test_idx], y[test_idx]
+
+    if task == "rcp":
+        sys.path.insert(0, TASKS["rcp"]["dir"])
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        from keypoints_model import build_model, HIDDEN_RAW, HIDDEN_POSE
+        # StratifiedKFold devuelve los índices ordenados (y las filas van agrupadas por clase):
+        # validation_split cogería el final, casi todo de una clase. Validación estratificada aparte
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_train, y_train, test_size=0.15, random_state=SEED + fold, stratify=y_train
+        )
+        scaler = StandardScaler().fit(X_train)
+        X_train, X_val, X_test = scaler.transform(X_train), scaler.transform(X_val), scaler.transform(X_test)
+        model = build_model(X.shape[1], HIDDEN_RAW if features == "raw" else HIDDEN_POSE)
+        es = tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=10, restore_best_weights=True)
+        model.fit(X_train, y_train, validation_data=(X_val, y_val), epochs=200, batch_size=32,
+                  callbacks=[es], verbose=0)
+    else:
+        spec = TASKS[task]
+        head = [tf.keras.layers.Dense(128, activation='relu')]
+        if spec["dropout"]:
+            head.append(tf.keras.layers.Dropout(spec["dropout"]))
+        model = tf.keras.Sequential([tf.keras.Input(shape=(X.shape[1],)), *head,
+                                     tf.keras.layers.Dense(1, activation='sigmoid')])
+        model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+        class_weight = None
+        if spec["balanced"]:
+            classes = np.unique(y_train)
+            class_weight = dict(zip(classes, compute_class_weight("balanced", classes=classes, y=y_train)))
+        model.fit(X_train, y_train, epochs=HEAD_EPOCHS, batch_size=32, class_weight=class_weight, verbose=0)
+
+    pred = (model.predict(X_test, verbose=0).reshape(-1) > 0.5).astype(np.int32)
+    tp = int(((pred == 1) & (y_test == 1)).sum())
+    return {
+        "fold": fold,
+        "accuracy": float((pred == y_test).mean()),
+        "precision": tp / max(int(pred.sum()), 1),
+        "recall": tp / max(int(y_test.sum()), 1),
+        "train_rows": len(train_idx), "test_rows": len(test_idx),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+# ---------- Una tarea: k folds en paralelo ----------
+def crossval(task, k, workers, features):
+    from sklearn.model_selection import StratifiedKFold
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+        x_path, y_path, rows, dims, seconds = executor.submit(prepare_shared, task, features).result()
+    print(f"📦 {task}: {rows} filas x {dims} ({seconds:.1f}s preparando datos)")
+
+    y = np.load(y_path)
+    folds = list(StratifiedKFold(n_splits=k, shuffle=True, random_state=SEED).split(np.zeros(len(y)), y))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    results = []
+    start = time.perf_counter()
+    # los procesos spawn heredan el entorno: OMP_NUM_THREADS tiene que estar puesto antes de que
+    # importen numpy/TF, así que se fija aquí (y se restaura al terminar) y no en init_worker
+    omp = os.environ.get("OMP_NUM_THREADS")
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    try:
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn"),
+                                 initializer=init_worker, initargs=(threads,)) as executor:
+            futures = [executor.submit(run_fold, task, i, x_path, y_path, train_idx, test_idx, features)
+                       for i, (train_idx, test_idx) in enumerate(folds)]
+            for future in as_completed(futures):
+                r = future.result()
+                results.append(r)
+                print(f"   fold {r['fold'] + 1}/{k}: accuracy {r['accuracy']*100:.2f}%  "
+                      f"precision {r['precision']*100:.2f}%  recall {r['recall']*100:.2f}%  ({r['seconds']:.1f}s)")
+    finally:
+        if omp is None:
+            os.environ.pop("OMP_NUM_THREADS", None)
+        else:
+            os.environ["OMP_NUM_THREADS"] = omp
+    wall = time.perf_counter() - start
+    results.sort(key=lambda r: r["fold"])
+
+    summary = {m: {"mean": float(np.mean([r[m] for r in results])), "std": float(np.std([r[m] for r in results]))}
+               for m in ("accuracy", "precision", "recall")}
+    fold_seconds = sum(r["seconds"] for r in results)
+    print(f"📊 {task}: accuracy {summary['accuracy']['mean']*100:.2f}% ± {summary['accuracy']['std']*100:.2f}  "
+          f"precision {summary['precision']['mean']*100:.2f}% ± {summary['precision']['std']*100:.2f}  "
+          f"recall {summary['recall']['mean']*100:.2f}% ± {summary['recall']['std']*100:.2f}")
+    print(f"⏱️ {k} folds en {wall:.1f}s con {workers} procesos x {threads} hilos "
+          f"(suma de folds {fold_seconds:.1f}s, x{fold_seconds / max(wall, 1e-9):.1f})")
+    return {"task": task, "k": k, "workers": workers, "threads_per_worker": threads,
+            "wall_seconds": round(wall, 2), "summary": summary, "folds": results}
+
+def main():
+    parser = argparse.ArgumentParser(description="Validación cruzada estratificada con los folds en paralelo")
+    parser.add_argument("--tasks", nargs="+", default=list(TASKS), choices=list(TASKS))
+    parser.add_argument("--k", type=int, default=K_FOLDS)
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS)
+    parser.add_argument("--features", default="raw", choices=["raw", "pose"], help="entrada del modelo RCP")
+    parser.add_argument("--out", default=None, help="guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    report = [crossval(task, args.k, args.workers, args.features) for task in args.tasks]
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Resultados en {args.out}")
+
+if __name__ == "__main__":
+    main()
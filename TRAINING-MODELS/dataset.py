@@ -0,0 +1,157 @@
+import os
+import tensorflow as tf
+from sklearn.model_selection import train_test_split
+from cache import decode_resize
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+# ---------- Listar imágenes (solo rutas, nada en memoria) ----------
+def list_images(folder_path, label):
+    files = sorted(
+        f for f in os.listdir(folder_path)
+        if os.path.isfile(os.path.join(folder_path, f))
+    )
+    print(f"📂 {len(files)} imágenes en {folder_path}")
+    paths = [os.path.join(folder_path, f) for f in files]
+    return paths, [label] * len(paths)
+
+def list_dataset(folders):
+    """folders: dict {carpeta: etiqueta}"""
+    paths, labels = [], []
+    for folder_path, label in folders.items():
+        p, l = list_images(folder_path, label)
+        paths += p
+        labels += l
+    print(f"✅ Total imágenes: {len(paths)}")
+    return paths, labels
+
+# ---------- Separar dataset (sobre rutas, no sobre píxeles) ----------
+def split_paths(paths, labels, test_size=0.2, val_size=0.2, seed=42):
+    p_train, p_test, y_train, y_test = train_test_split(
+        paths, labels, test_size=test_size, stratify=labels, random_state=seed
+    )
+    # reemplaza a validation_split de Keras, que no funciona con tf.data
+    p_train, p_val, y_train, y_val = train_test_split(
+        p_train, y_train, test_size=val_size, stratify=y_train, random_state=seed
+    )
+    return (p_train, y_train), (p_val, y_val), (p_test, y_test)
+
+# ---------- Decodificar + redimensionar + normalizar ----------
+def _read_image(path, img_size):
+    img = decode_resize(path.decode(), img_size)
+    if img is None:
+        # ignore_errors la salta con un aviso, como hace la caché con cv2.imread -> None
+        raise ValueError(f"{path.decode()} no se pudo decodificar")
+    return img
+
+def decode_image(path, img_size=(224,224), normalize=True):
+    # cv2 igual que cache.py: tf.io.decode_image no lee .webp (los que guarda download_images.py)
+    img = tf.numpy_function(lambda p: _read_image(p, img_size), [path], tf.uint8)
+    img.set_shape((img_size[1], img_size[0], 3))
+    if normalize:
+        return tf.cast(img, tf.float32) / 255.0
+    # uint8: 4 veces menos memoria que float32; el modelo normaliza con Rescaling
+    return img
+
+def model_normalizes_input(model):
+    """True si el modelo trae su propia capa Rescaling (espera píxeles 0-255)"""
+    return any(isinstance(layer, tf.keras.layers.Rescaling) for layer in model.layers[:3])
+
+# ---------- Aumento de datos al vuelo ----------
+def repeat_by_class(paths, labels, class_multiplier):
+    """class_multiplier: {etiqueta: copias por época}; cada copia recibe un aumento distinto"""
+    if not class_multiplier:
+        return list(paths), list(labels)
+    out_paths, out_labels = [], []
+    for p, l in zip(paths, labels):
+        n = class_multiplier.get(l, 1)
+        out_paths += [p] * n
+        out_labels += [l] * n
+    return out_paths, out_labels
+
+def augment_batch(augmenter, imgs, names, variants):
+    """Aplica augmenter (BatchAugmenter de augment.py) a un lote uint8 en un hilo de tf.data.
+
+    La semilla de cada imagen sale de (nombre, variante) y la variante viene de
+    Dataset.random, distinta en cada época: reproducible pero nunca repetida.
+    """
+    out = tf.numpy_function(
+        lambda i, n, v: augmenter.apply(i, [x.decode() for x in n], v),
+        [imgs, names, variants], tf.uint8,
+    )
+    out.set_shape(imgs.shape)
+    return out
+
+def _with_variants(ds, augmenter, seed):
+    if augmenter is None:
+        return ds
+    variants = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True)
+    return tf.data.Dataset.zip((ds, variants)).map(lambda x, v: (*x, v % 2**31))  # semillas >= 0
+
+def _finish_batch(imgs, labels, names, variants, augmenter, normalize):
+    if augmenter is not None:
+        imgs = augment_batch(augmenter, imgs, names, variants)
+    if normalize:
+        imgs = tf.cast(imgs, tf.float32) / 255.0
+    return imgs, labels
+
+# ---------- Pipeline tf.data ----------
+def make_dataset(paths, labels, img_size=(224,224), batch_size=32, shuffle=False, seed=42,
+                 cache=None, normalize=True, augmenter=None, class_multiplier=None):
+    """augmenter: aumento al vuelo por lote (solo para entrenamiento); class_multiplier:
+    cuántas copias aumentadas de cada clase se ven por época. Nada se escribe a disco."""
+    paths, labels = repeat_by_class(paths, labels, class_multiplier)
+    if cache is not None:
+        return make_cached_dataset(cache, paths, labels, batch_size, shuffle, seed, normalize, augmenter)
+    ds = tf.data.Dataset.from_tensor_slices((list(paths), list(labels)))
+    if shuffle:
+        # se barajan rutas (strings), no imágenes: el buffer no pesa
+        ds = ds.shuffle(len(paths), seed=seed, reshuffle_each_iteration=True)
+    if augmenter is None:
+        ds = ds.map(
+            lambda p, l: (decode_image(p, img_size, normalize), l),
+            num_parallel_calls=AUTOTUNE,
+            deterministic=not shuffle,
+        )
+        # archivos corruptos o que no son imagen se saltan (como cv2.imread -> None)
+        ds = ds.ignore_errors(log_warning=True)
+        return ds.batch(batch_size).prefetch(AUTOTUNE)
+
+    # con aumento: se decodifica a uint8, se aumenta el lote entero y luego se normaliza
+    ds = ds.map(
+        lambda p, l: (decode_image(p, img_size, normalize=False), l, p),
+        num_parallel_calls=AUTOTUNE,
+        deterministic=not shuffle,
+    )
+    ds = ds.ignore_errors(log_warning=True)
+    ds = _with_variants(ds, augmenter, seed).batch(batch_size)
+    ds = ds.map(
+        lambda i, l, p, v: _finish_batch(i, l, p, v, augmenter, normalize),
+        num_parallel_calls=AUTOTUNE,
+        deterministic=not shuffle,
+    )
+    return ds.prefetch(AUTOTUNE)
+
+# ---------- Pipeline desde la caché (sin decodificar JPEG) ----------
+def make_cached_dataset(cache, paths, labels, batch_size=32, shuffle=False, seed=42, normalize=True,
+                        augmenter=None):
+    """Lee lotes de los shards mapeados en memoria; requiere cache.update(paths) antes"""
+    pairs = [(k, l) for k, l in zip(cache.lookup(paths), labels) if k is not None]
+    keys = [k for k, _ in pairs]
+    labels = [l for _, l in pairs]
+    cache.open_all()
+    w, h = cache.img_size
+
+    def load_batch(batch_keys, batch_labels, variants=None):
+        imgs = tf.numpy_function(
+            lambda k: cache.gather([x.decode() for x in k]), [batch_keys], tf.uint8
+        )
+        imgs.set_shape((None, h, w, 3))
+        return _finish_batch(imgs, batch_labels, batch_keys, variants, augmenter, normalize)
+
+    ds = tf.data.Dataset.from_tensor_slices((keys, labels))
+    if shuffle:
+        ds = ds.shuffle(len(keys), seed=seed, reshuffle_each_iteration=True)
+    ds = _with_variants(ds, augmenter, seed).batch(batch_size)
+    ds = ds.map(load_batch, num_parallel_calls=AUTOTUNE, deterministic=not shuffle)
+    return ds.prefetch(AUTOTUNE)
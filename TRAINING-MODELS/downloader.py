@@ -0,0 +1,110 @@
+import os
+import time
+import hashlib
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Códigos que vale la pena reintentar; el resto de 4xx/5xx es fallo permanente
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# status: ok | exists | failed (permanente) | retry (temporal, se agotaron los intentos)
+DownloadResult = namedtuple(
+    "DownloadResult", "url path status http_code bytes sha256 attempts error"
+)
+
+class RetryableError(Exception):
+    pass
+
+class Downloader:
+    """Descargas concurrentes con conexiones reutilizadas (keep-alive) por host.
+
+    - max_workers: descargas simultáneas en total
+    - per_host: descargas simultáneas contra un mismo host
+    - el cuerpo se escribe por bloques a <destino>.part y se renombra al terminar
+    - errores de red / 429 / 5xx se reintentan con backoff exponencial
+    """
+
+    def __init__(self, max_workers=8, per_host=4, retries=3, backoff=1.0, timeout=10,
+                 chunk_size=64 * 1024, headers=None, session=None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        # una sola sesión: urllib3 mantiene un pool de conexiones por host
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max(per_host, 1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT, **(headers or {})})
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _slot(self, host):
+        with self._lock:
+            slot = self._host_slots.setdefault(host, threading.Semaphore(self.per_host))
+        with slot:
+            yield
+
+    def _stream_to(self, resp, path):
+        tmp = path + ".part"
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in resp.iter_content(self.chunk_size):
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+            os.replace(tmp, path)  # atómico: nunca queda un archivo a medias con el nombre final
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return size, sha256.hexdigest()
+
+    def fetch(self, url, dest):
+        """dest: ruta final, o función(url, response) -> ruta (p. ej. extensión por content-type)"""
+        if isinstance(dest, str) and os.path.exists(dest):
+            return DownloadResult(url, dest, "exists", None, os.path.getsize(dest), None, 0, None)
+
+        host = urlparse(url).netloc
+        code, error = None, None
+        for attempt in range(1, self.retries + 1):
+            try:
+                with self._slot(host), self.session.get(url, stream=True, timeout=self.timeout) as resp:
+                    code = resp.status_code
+                    if code in RETRY_STATUS:
+                        raise RetryableError(f"HTTP {code}")
+                    if code >= 400:
+                        return DownloadResult(url, None, "failed", code, 0, None, attempt, f"HTTP {code}")
+                    path = dest(url, resp) if callable(dest) else dest
+                    if os.path.exists(path):
+                        return DownloadResult(url, path, "exists", code, os.path.getsize(path), None, attempt, None)
+                    size, sha256 = self._stream_to(resp, path)
+                    return DownloadResult(url, path, "ok", code, size, sha256, attempt, None)
+            except (RetryableError, requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                error = str(e)
+            except (requests.RequestException, OSError) as e:
+                # URL inválida, demasiadas redirecciones, disco...: no se reintenta
+                return DownloadResult(url, None, "failed", code, 0, None, attempt, str(e))
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+        return DownloadResult(url, None, "retry", code, 0, None, self.retries, error)
+
+    def download_many(self, jobs):
+        """jobs: iterable de (url, dest). Devuelve los resultados a medida que terminan"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.fetch, url, dest) for url, dest in jobs]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,71 @@
+import os
+import json
+import numpy as np
+import tensorflow as tf
+
+# Cambia si cambia el backbone, sus pesos o el preprocesado -> se recalcula todo
+BACKBONE_VERSION = f"mobilenetv2_1.0_224_imagenet_rescale255_tf{tf.__version__}"
+
+# ---------- Extractor: mismo preprocesado que el modelo completo ----------
+def build_extractor(base_model):
+    """uint8 -> Rescaling -> MobileNetV2 congelado -> GlobalAveragePooling2D (1280)"""
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=base_model.input_shape[1:]),
+        tf.keras.layers.Rescaling(1./255),
+        base_model,
+        tf.keras.layers.GlobalAveragePooling2D(),
+    ])
+
+class EmbeddingCache:
+    """Embeddings del backbone congelado, indexados por sha1 de la imagen (ver cache.py)"""
+
+    def __init__(self, cache_dir, version=BACKBONE_VERSION):
+        self.dir = os.path.join(cache_dir, f"embeddings_{version}")
+        self.index_path = os.path.join(self.dir, "index.json")
+        self.entries, self.shards = {}, []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            self.entries, self.shards = index["entries"], index["shards"]
+        self._arrays = {}
+
+    def update(self, image_cache, paths, extractor, batch_size=64):
+        """Pasa por el backbone solo las imágenes que aún no tienen embedding"""
+        keys = [k for k in image_cache.lookup(paths) if k is not None]
+        missing = [k for k in dict.fromkeys(keys) if k not in self.entries]
+        if not missing:
+            print(f"⚡ {len(keys)} embeddings servidos desde la caché")
+            return
+        print(f"🧠 Calculando {len(missing)} embeddings con el backbone")
+        image_cache.open_all()
+        feats = []
+        for start in range(0, len(missing), batch_size):
+            batch = image_cache.gather(missing[start:start + batch_size])
+            feats.append(extractor.predict_on_batch(batch).astype(np.float32))
+        feats = np.concatenate(feats)
+
+        os.makedirs(self.dir, exist_ok=True)
+        shard = f"shard_{len(self.shards):05d}.npy"
+        path = os.path.join(self.dir, shard)
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, feats)
+        os.replace(path + ".tmp", path)
+        self.shards.append(shard)
+        for row, sha1 in enumerate(missing):
+            self.entries[sha1] = [shard, row]
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries, "shards": self.shards}, f)
+        os.replace(tmp, self.index_path)
+
+    def shard(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.dir, name), mmap_mode="r")
+        return self._arrays[name]
+
+    def load(self, image_cache, paths, labels):
+        """Devuelve (X, y) con los embeddings de las rutas legibles"""
+        pairs = [(k, l) for k, l in zip(image_cache.lookup(paths), labels) if k is not None]
+        X = np.stack([self.shard(self.entries[k][0])[self.entries[k][1]] for k, _ in pairs])
+        y = np.array([l for _, l in pairs])
+        return X, y
@@ -0,0 +1,113 @@
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+import tensorflow as tf
+from dataset import split_paths
+
+# Modo incremental: imágenes antiguas (ya vistas por el modelo) que se repasan por cada nueva,
+# para que el ajuste no olvide lo aprendido
+REPLAY_RATIO = 1.0
+FINE_TUNE_LR = 1e-4
+FINE_TUNE_EPOCHS = 5
+
+def parse_args(description, default_base):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--resume", action="store_true",
+                        help="continuar un entrenamiento interrumpido desde su último checkpoint")
+    parser.add_argument("--incremental", action="store_true",
+                        help="partir del modelo en producción y ajustarlo solo con las imágenes nuevas + repaso")
+    parser.add_argument("--base", default=default_base, help="modelo .h5 del que parte --incremental")
+    parser.add_argument("--replay", type=float, default=REPLAY_RATIO,
+                        help="imágenes antiguas por cada nueva en --incremental")
+    return parser.parse_args()
+
+# ---------- Checkpoints ----------
+def checkpoint_callback(cache_dir, name, resume):
+    """BackupAndRestore en <cache_dir>/checkpoints: estado de entrenamiento (pesos + optimizador +
+    época) guardado al final de cada época. Si el proceso muere, --resume sigue desde la última
+    época completa (se borra al terminar bien). Sin --resume se descarta cualquier estado anterior."""
+    backup_dir = os.path.join(cache_dir, "checkpoints", name)
+    if not resume:
+        shutil.rmtree(backup_dir, ignore_errors=True)
+    elif os.path.isdir(backup_dir) and os.listdir(backup_dir):
+        print(f"⏯️ Reanudando desde {backup_dir}")
+    else:
+        print(f"⚠️ No hay checkpoint en {backup_dir}, se empieza de cero")
+    return tf.keras.callbacks.BackupAndRestore(backup_dir, save_freq="epoch", delete_checkpoint=True)
+
+# ---------- Modelo en producción ----------
+def load_trained(path):
+    """(modelo, backbone, capas de la cabeza) del .h5 entrenado: mismas piezas que arma trainmodel.py"""
+    model = tf.keras.models.load_model(path, compile=False)
+    base_model = next(l for l in model.layers if l.name.startswith("mobilenetv2"))
+    gap = next(i for i, l in enumerate(model.layers) if isinstance(l, tf.keras.layers.GlobalAveragePooling2D))
+    return model, base_model, model.layers[gap + 1:]
+
+# ---------- Partición estable train/val/test ----------
+SPLIT_NAMES = ("train", "val", "test")
+
+def split_file(model_path):
+    return os.path.splitext(model_path)[0] + "_split.json"
+
+def save_split(model_path, cache, splits):
+    """sha1 de las imágenes de train/val/test del modelo: el siguiente --incremental mantiene
+    cada imagen en su partición aunque se renombre o cambie el contenido de la carpeta"""
+    data = {name: sorted({k for k in cache.lookup(p) if k is not None})
+            for name, (p, _) in zip(SPLIT_NAMES, splits)}
+    with open(split_file(model_path), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+def load_split(model_path):
+    if not os.path.exists(split_file(model_path)):
+        raise FileNotFoundError(
+            f"No existe {split_file(model_path)}: entrena una vez sin --incremental para registrar la partición"
+        )
+    with open(split_file(model_path), "r", encoding="utf-8") as f:
+        return {name: set(keys) for name, keys in json.load(f).items()}
+
+def stable_split(base_path, cache, paths, labels, test_size=0.2, val_size=0.2):
+    """Misma partición que el modelo base para las imágenes que ya conocía; las nuevas caen en
+    train/val/test según su sha1 (mismas proporciones que split_paths). Volver a partir la carpeta
+    completa mezclaría imágenes de entrenamiento en el test"""
+    known = load_split(base_path)
+    splits = {name: ([], []) for name in SPLIT_NAMES}
+    for p, y, k in zip(paths, labels, cache.lookup(paths)):
+        if k is None:
+            continue
+        name = next((n for n in SPLIT_NAMES if k in known[n]), None)
+        if name is None:
+            bucket = int(k[:8], 16) / 0x100000000
+            name = "test" if bucket < test_size else "val" if bucket < test_size + (1 - test_size) * val_size else "train"
+        splits[name][0].append(p)
+        splits[name][1].append(y)
+    return tuple(splits[name] for name in SPLIT_NAMES)
+
+def saved_split(model_path, cache, paths, labels):
+    """Partición con la que se entrenó model_path, para evaluarlo solo con su test: split_paths sobre
+    las carpetas actuales mezclaría imágenes de entrenamiento si se añadieron imágenes o tras --incremental.
+    Sin <modelo>_split.json (modelos anteriores a save_split) se vuelve a split_paths."""
+    if not os.path.exists(split_file(model_path)):
+        print(f"⚠️ No existe {split_file(model_path)}: se usa split_paths sobre las carpetas actuales")
+        return split_paths(paths, labels)
+    known = load_split(model_path)
+    splits = {name: ([], []) for name in SPLIT_NAMES}
+    for p, y, k in zip(paths, labels, cache.hashes(paths)):
+        name = next((n for n in SPLIT_NAMES if k in known[n]), None)
+        if name is not None:
+            splits[name][0].append(p)
+            splits[name][1].append(y)
+    return tuple(splits[name] for name in SPLIT_NAMES)
+
+def incremental_split(base_path, cache, paths, labels, replay_ratio=REPLAY_RATIO, seed=42):
+    """Imágenes de train que el modelo base no vio + una muestra al azar de las que sí vio"""
+    seen = load_split(base_path)["train"]
+    keys = cache.lookup(paths)
+    new = [i for i, k in enumerate(keys) if k is not None and k not in seen]
+    old = [i for i, k in enumerate(keys) if k is not None and k in seen]
+    n_replay = min(len(old), int(round(len(new) * replay_ratio)))
+    replay = np.random.default_rng(seed).choice(old, n_replay, replace=False).tolist() if n_replay else []
+    print(f"🆕 {len(new)} imágenes nuevas + {len(replay)} de repaso (de {len(old)} ya vistas)")
+    idx = sorted(new + replay)
+    return [paths[i] for i in idx], [labels[i] for i in idx], len(new)
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import numpy as np
+import tensorflowjs as tfjs
+import tensorflow as tf
+from google.protobuf import json_format
+from tensorflow.core.framework import graph_pb2
+from tensorflowjs import read_weights
+from quantize import dir_size
+
+# Shards de 1 MB (el conversor usa 4 MB): con HTTP/2 las descargas en paralelo comparten conexión,
+# y al reentrenar solo cambian en la caché del navegador los shards cuyos pesos cambiaron
+SHARD_SIZE_BYTES = 1024 * 1024
+LATENCY_RUNS = 50
+
+# ---------- Exportar graph-model ----------
+def export_graph_model(model, out_dir, shard_size_bytes=SHARD_SIZE_BYTES, quantization_dtype_map=None):
+    """Keras -> SavedModel -> graph-model TFJS (cargar con tf.loadGraphModel).
+
+    El conversor congela las variables, pliega constantes y fusiona BatchNorm, bias y
+    activación dentro de las conv/matmul (_FusedConv2D, _FusedMatMul...).
+    """
+    spec = tf.TensorSpec([None, *model.input_shape[1:]], tf.float32, name="input")
+    serving = tf.function(lambda x: model(x, training=False)).get_concrete_function(spec)
+    with tempfile.TemporaryDirectory() as saved_dir:
+        tf.saved_model.save(model, saved_dir, signatures=serving)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        tfjs.converters.convert_tf_saved_model(
+            saved_dir, out_dir,
+            quantization_dtype_map=quantization_dtype_map,
+            weight_shard_size_bytes=shard_size_bytes,
+        )
+
+# ---------- Cargar los artefactos TFJS desde Python ----------
+def _expand_tfjs_ops(graph_def):
+    """FusedDepthwiseConv2dNative solo existe en TFJS: se ejecuta como depthwise + bias + activación
+    (mismo cálculo; el resto de ops fusionadas, _FusedConv2D/_FusedMatMul, son de TF)"""
+    out = graph_pb2.GraphDef()
+    out.versions.CopyFrom(graph_def.versions)
+    for node in graph_def.node:
+        if node.op != "FusedDepthwiseConv2dNative":
+            out.node.add().CopyFrom(node)
+            continue
+        # fused_ops: [BiasAdd | NoOp, activación | NoOp], o una sola op (BiasAdd o la activación)
+        fused = [s.decode() for s in node.attr["fused_ops"].list.s]
+        if len(fused) == 2 and fused[0] in ("BiasAdd", "NoOp"):
+            bias_op, activation = fused
+        elif len(fused) == 1:
+            bias_op, activation = ("BiasAdd", "NoOp") if fused[0] == "BiasAdd" else ("NoOp", fused[0])
+        else:
+            raise ValueError(f"fused_ops no soportado en {node.name}: {fused}")
+        conv = out.node.add()
+        conv.CopyFrom(node)
+        conv.name, conv.op = node.name + "/depthwise", "DepthwiseConv2dNative"
+        del conv.input[2:]
+        for attr in ("fused_ops", "num_args", "leakyrelu_alpha"):
+            conv.attr.pop(attr, None)
+        last = conv.name
+        if bias_op == "BiasAdd":
+            bias = out.node.add(name=node.name + "/bias", op="BiasAdd", input=[last, node.input[2]])
+            bias.attr["T"].CopyFrom(node.attr["T"])
+            last = bias.name
+        act = out.node.add(name=node.name, op=activation if activation != "NoOp" else "Identity", input=[last])
+        act.attr["T"].CopyFrom(node.attr["T"])
+        if activation == "LeakyRelu":
+            act.attr["alpha"].f = node.attr["leakyrelu_alpha"].f
+    return out
+
+def load_graph_model(model_dir):
+    """Ejecuta el mismo grafo fusionado que tf.loadGraphModel: GraphDef de model.json + pesos"""
+    with open(os.path.join(model_dir, "model.json"), "r", encoding="utf-8") as f:
+        model_json = json.load(f)
+    graph_def = json_format.ParseDict(model_json["modelTopology"], graph_pb2.GraphDef())
+    weights = {w["name"]: w["data"]
+               for group in read_weights.read_weights(model_json["weightsManifest"], model_dir)
+               for w in group}
+    for node in graph_def.node:
+        if node.name in weights:
+            node.attr["value"].tensor.CopyFrom(tf.make_tensor_proto(weights[node.name]))
+    graph_def = _expand_tfjs_ops(graph_def)
+    inputs = [v["name"] for v in model_json["signature"]["inputs"].values()]
+    outputs = [v["name"] for v in model_json["signature"]["outputs"].values()]
+    graph = tf.compat.v1.wrap_function(lambda: tf.compat.v1.import_graph_def(graph_def, name=""), [])
+    fn = graph.prune(inputs, outputs)
+    return lambda x: fn(tf.constant(x, tf.float32))[0].numpy(), len(graph_def.node)
+
+def load_layers_model(model_dir):
+    """Como tf.loadLayersModel: reconstruye las capas (sin fusionar). Se traza como función, igual
+    que el graph-model, para que la comparación mida la exportación y no eager frente a grafo"""
+    model = tfjs.converters.load_keras_model(os.path.join(model_dir, "model.json"))
+    spec = tf.TensorSpec([None, *model.input_shape[1:]], tf.float32)
+    fn = tf.function(lambda x: model(x, training=False), input_signature=[spec])
+    return lambda x: fn(tf.constant(x, tf.float32)).numpy(), len(model.layers)
+
+# ---------- Comparación ----------
+def compare_tfjs(layers_dir, graph_dir, runs=LATENCY_RUNS):
+    """Tamaño, nº de shards, tiempo de carga y latencia por frame (batch 1) de cada artefacto.
+
+    Medido con TF en CPU: los tiempos absolutos del navegador serán otros, pero la
+    diferencia entre cargar/ejecutar capas sueltas y un grafo fusionado se mantiene.
+    """
+    with open(os.path.join(graph_dir, "model.json"), "r", encoding="utf-8") as f:
+        signature_input = next(iter(json.load(f)["signature"]["inputs"].values()))
+    shape = [int(d["size"]) for d in signature_input["tensorShape"]["dim"][1:]]
+    frame = np.random.default_rng(42).random((1, *shape), dtype=np.float32)
+
+    rows, outputs = [], []
+    for kind, model_dir, loader in (("layers", layers_dir, load_layers_model),
+                                    ("graph", graph_dir, load_graph_model)):
+        start = time.perf_counter()
+        predict, n_ops = loader(model_dir)
+        load_s = time.perf_counter() - start
+        outputs.append(predict(frame))  # primera llamada = calentamiento
+        times = []
+        for _ in range(runs):
+            t = time.perf_counter()
+            predict(frame)
+            times.append((time.perf_counter() - t) * 1000)
+        shards = len([f for f in os.listdir(model_dir) if f.endswith(".bin")])
+        rows.append((kind, dir_size(model_dir), shards, n_ops, load_s * 1000, float(np.median(times))))
+
+    print(f"\n🧮 layers-model vs graph-model (diferencia máx. de salida: {np.abs(outputs[0] - outputs[1]).max():.2e})")
+    print(f"{'artefacto':<10}{'tamaño':>10}{'shards':>8}{'capas/nodos':>13}{'carga':>11}{'por frame':>12}")
+    for kind, size, shards, n_ops, load_ms, frame_ms in rows:
+        print(f"{kind:<10}{size / 1024:>7.0f} KB{shards:>8}{n_ops:>13}{load_ms:>8.0f} ms{frame_ms:>9.2f} ms")
+    return rows
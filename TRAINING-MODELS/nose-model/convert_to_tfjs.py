@@ -0,0 +1,60 @@
+import os
+import sys
+import numpy as np
+import tensorflowjs as tfjs
+import tensorflow as tf
+# dataset.py, cache.py, finetune.py, quantize.py y graph_model.py son comunes a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset import list_dataset, model_normalizes_input
+from cache import ImageCache
+from finetune import saved_split
+from quantize import export_quantized
+from graph_model import export_graph_model, compare_tfjs
+
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+MODEL_PATH = "nose_detection_model.h5"
+
+# Además del TFJS float32, generar variantes cuantizadas (TFJS uint8/float16, TFLite int8) con su informe
+QUANTIZE = True
+CALIBRATION_SAMPLES = 200
+# Evaluación sobre una muestra del test (uint8 en memoria: ~150 KB por imagen)
+EVAL_SAMPLES = 1000
+# Graph-model (ops fusionadas, shards de 1 MB) para tf.loadGraphModel, comparado con el layers-model
+GRAPH_MODEL = True
+
+# Cargar el modelo .h5 que guarda trainmodel.py
+model = tf.keras.models.load_model(MODEL_PATH)
+
+# Exportar a formato TensorFlow.js (lo que usa la app)
+tfjs.converters.save_keras_model(model, "nose_detection_model_web")
+
+if GRAPH_MODEL:
+    export_graph_model(model, "nose_detection_graph_model")
+    compare_tfjs("nose_detection_model_web", "nose_detection_graph_model")
+
+if QUANTIZE:
+    blood_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sangre"
+    healthy_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sana"
+    paths, labels = list_dataset({blood_dir: 1, healthy_dir: 0})
+    # preprocesado desde la caché, sin escribir en ella
+    cache = ImageCache(CACHE_DIR, readonly=True)
+    # partición guardada por trainmodel.py: calibración con train, evaluación con test
+    (p_train, _), _, (p_test, y_test) = saved_split(MODEL_PATH, cache, paths, labels)
+    rng = np.random.default_rng(42)
+    p_calib = [p_train[i] for i in sorted(rng.choice(len(p_train), min(CALIBRATION_SAMPLES, len(p_train)), replace=False))]
+    calib_keys = [k for k in cache.update(p_calib) if k is not None]
+    idx = sorted(rng.choice(len(p_test), min(EVAL_SAMPLES, len(p_test)), replace=False))
+    p_test, y_test = [p_test[i] for i in idx], [y_test[i] for i in idx]
+    test_keys = cache.update(p_test)
+    calibration = cache.gather(calib_keys)
+    X_eval = cache.gather([k for k in test_keys if k is not None])
+    y_eval = np.array([l for k, l in zip(test_keys, y_test) if k is not None])
+
+    if model_normalizes_input(model):
+        # entrada uint8 0-255 (Rescaling dentro del modelo), también en TFLite
+        export_quantized(model, "quantized", "nose_detection", calibration, X_eval, y_eval, input_type=tf.uint8)
+    else:
+        # se queda en uint8 y se divide entre 255 por lotes en float32 (no una copia float64 del test)
+        export_quantized(model, "quantized", "nose_detection", calibration, X_eval, y_eval, input_scale=1 / 255)
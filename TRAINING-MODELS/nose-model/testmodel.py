@@ -1,84 +1,67 @@
 import os
-import cv2
+import sys
+import time
 import numpy as np
 import tensorflow as tf
-from sklearn.model_selection import train_test_split
-from sklearn.utils.class_weight import compute_class_weight
+from sklearn.metrics import confusion_matrix
+# dataset.py, cache.py y finetune.py son comunes a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset import list_dataset, make_dataset, model_normalizes_input
+from cache import ImageCache
+from finetune import saved_split
 
-# ---------- Cargar imágenes ----------
-def load_images(folder_path, label, img_size=(224,224)):
-    images, labels = [], []
-    files = os.listdir(folder_path)
-    print(f"📂 Cargando {len(files)} imágenes de {folder_path}")
-    for i, f in enumerate(files,1):
-        path = os.path.join(folder_path, f)
-        img = cv2.imread(path)
-        if img is None: 
-            print(f"⚠️ {f} no cargada")
-            continue
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, img_size)
-        images.append(img / 255.0)
-        labels.append(label)
-        if i % 100 == 0 or i == len(files):
-            print(f"  ✅ {i}/{len(files)} imágenes cargadas")
-    return np.array(images), np.array(labels)
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
 
-# ---------- Rutas de dataset ----------
+# Solo evalúa: carga el modelo ya entrenado por trainmodel.py y no escribe nada a disco
+MODEL_PATH = "nose_detection_model.h5"
+BATCH_SIZE = 64
+THRESHOLD = 0.5
+CLASS_NAMES = {0: "Sana", 1: "Sangrado"}
+
+# ---------- Rutas de dataset (las mismas que trainmodel.py) ----------
 blood_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sangre"
 healthy_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sana"
 
-X_blood, y_blood = load_images(blood_dir, 1)
-X_healthy, y_healthy = load_images(healthy_dir, 0)
-
-X = np.concatenate([X_blood, X_healthy])
-y = np.concatenate([y_blood, y_healthy])
-print(f"✅ Total imágenes: {len(X)}")
-
-# ---------- Separar dataset ----------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, stratify=y, random_state=42
-)
-
-# ---------- Modelo base ----------
-base_model = tf.keras.applications.MobileNetV2(
-    input_shape=(224,224,3), include_top=False, weights='imagenet'
-)
-base_model.trainable = False  # congelar pesos
-
-# ---------- Construcción del modelo ----------
-model = tf.keras.Sequential([
-    base_model,
-    tf.keras.layers.GlobalAveragePooling2D(),
-    tf.keras.layers.Dense(128, activation='relu'),
-    tf.keras.layers.Dropout(0.3),
-    tf.keras.layers.Dense(1, activation='sigmoid')
-])
+paths, labels = list_dataset({blood_dir: 1, healthy_dir: 0})
 
-model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+# ---------- Conjunto de test ----------
+# readonly: lo que no esté en .cache/ se decodifica en memoria, sin tocar la caché
+cache = ImageCache(CACHE_DIR, readonly=True)
+# el test guardado con el modelo (<modelo>_split.json): imágenes que nunca vio, también tras --incremental
+_, _, (p_test, y_test) = saved_split(MODEL_PATH, cache, paths, labels)
+print(f"🧪 {len(p_test)} imágenes de test")
 
-# ---------- Balanceo de clases ----------
-class_weights = compute_class_weight(
-    "balanced",
-    classes=np.unique(y_train),
-    y=y_train
-)
-class_weights = dict(enumerate(class_weights))
-print(f"⚖️ Class Weights: {class_weights}")
+# ---------- Modelo ----------
+model = tf.keras.models.load_model(MODEL_PATH, compile=False)
+# Modelos exportados con Rescaling reciben uint8 directamente
+normalize = not model_normalizes_input(model)
+infer = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
 
-# ---------- Entrenar ----------
-history = model.fit(
-    X_train, y_train,
-    validation_split=0.2,
-    epochs=15,
-    batch_size=32,
-    class_weight=class_weights
-)
+# ---------- Preprocesado desde la caché ----------
+cache.update(p_test)
+test_ds = make_dataset(p_test, y_test, batch_size=BATCH_SIZE, cache=cache, normalize=normalize)
 
-# ---------- Guardar en formato compatible con TFJS ----------
-model.save("nose_detection_model.h5")   # para convertir luego con tensorflowjs_converter
-print("💾 Guardado en formato .h5 listo para TFJS")
+# ---------- Inferencia por lotes ----------
+start = time.perf_counter()
+y_true, scores = [], []
+for imgs, batch_labels in test_ds:
+    scores.append(infer(imgs).numpy().reshape(-1))
+    y_true.append(batch_labels.numpy())
+elapsed = time.perf_counter() - start
+y_true = np.concatenate(y_true)
+scores = np.concatenate(scores)
+y_pred = (scores > THRESHOLD).astype(int)
 
-# ---------- Evaluar ----------
-loss, acc = model.evaluate(X_test, y_test)
+# ---------- Resultados ----------
+cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
+acc = np.trace(cm) / max(cm.sum(), 1)
+print(f"⚡ {len(scores)} imágenes en {elapsed:.2f}s ({len(scores) / max(elapsed, 1e-9):.1f} img/s)")
+print(f"\n📊 Matriz de confusión (filas = real, columnas = predicho), umbral {THRESHOLD}")
+print(f"{'':>10}{CLASS_NAMES[0]:>10}{CLASS_NAMES[1]:>10}")
+for label, counts in zip([0, 1], cm):
+    print(f"{CLASS_NAMES[label]:>10}{counts[0]:>10}{counts[1]:>10}")
+for label in (0, 1):
+    total = cm[label].sum()
+    print(f"   {CLASS_NAMES[label]}: {cm[label, label]}/{total} aciertos")
 print(f"🎯 Test Accuracy: {acc*100:.2f}%")
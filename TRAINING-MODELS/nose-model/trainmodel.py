@@ -1,93 +1,153 @@
 import os
-import cv2
+import sys
 import numpy as np
 import tensorflow as tf
-from sklearn.model_selection import train_test_split
 from sklearn.utils.class_weight import compute_class_weight
+# dataset.py, cache.py, embeddings.py y finetune.py son comunes a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset import list_dataset, split_paths, make_dataset, model_normalizes_input
+from cache import ImageCache
+from embeddings import EmbeddingCache, build_extractor
+from finetune import (parse_args, checkpoint_callback, load_trained, save_split, stable_split,
+                      incremental_split, FINE_TUNE_LR, FINE_TUNE_EPOCHS)
 
-# ---------- Cargar imágenes ----------
-def load_images(folder_path, label, img_size=(224,224)):
-    images, labels = [], []
-    files = os.listdir(folder_path)
-    print(f"📂 Cargando {len(files)} imágenes de {folder_path}")
-    for i, f in enumerate(files,1):
-        path = os.path.join(folder_path, f)
-        img = cv2.imread(path)
-        if img is None: 
-            print(f"⚠️ {f} no cargada")
-            continue
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, img_size)
-        images.append(img / 255.0)
-        labels.append(label)
-        if i % 100 == 0 or i == len(files):
-            print(f"  ✅ {i}/{len(files)} imágenes cargadas")
-    return np.array(images), np.array(labels)
+# .cache/ de este modelo (imágenes decodificadas y embeddings, ignorada por git)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# Reutilizar imágenes ya decodificadas en .cache/ (solo se decodifica lo nuevo)
+USE_CACHE = True
+# Imágenes uint8 hasta el modelo; la capa Rescaling normaliza dentro del grafo.
+# Desactivado: Technique.tsx todavía divide entre 255 antes de predict(). Para activarlo hay que
+# quitar el .div(tf.scalar(255)) del modelo correspondiente en Technique.tsx al publicar el nuevo modelo
+NORMALIZE_IN_MODEL = False
+# Backbone congelado: calcular sus embeddings una vez y entrenar solo la cabeza Dense.
+# Mucho más rápido, pero sin data_augmentation (se aplica antes del backbone)
+USE_EMBEDDINGS = False
+MODEL_PATH = "nose_detection_model.h5"  # lo evalúa testmodel.py y se convierte con tensorflowjs_converter
+EPOCHS = 15
+
+# --resume: seguir un entrenamiento interrumpido; --incremental: ajustar MODEL_PATH con lo nuevo
+args = parse_args("Entrena el detector de sangrado nasal", MODEL_PATH)
 
 # ---------- Rutas de dataset ----------
-burned_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sangre"
+blood_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sangre"
 healthy_dir = "C:/Users/estro/Desktop/rcp-model/nose-model/nariz_sana"
 
-X_burned, y_burned = load_images(burned_dir, 1)
-X_healthy, y_healthy = load_images(healthy_dir, 0)
+paths, labels = list_dataset({blood_dir: 1, healthy_dir: 0})
 
-X = np.concatenate([X_burned, X_healthy])
-y = np.concatenate([y_burned, y_healthy])
-print(f"✅ Total imágenes: {len(X)}")
+cache = None
+if USE_CACHE or USE_EMBEDDINGS or args.incremental:
+    cache = ImageCache(CACHE_DIR)
+    cache.update(paths)
 
 # ---------- Separar dataset ----------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, stratify=y, random_state=42
-)
+if args.incremental:
+    # las imágenes ya conocidas conservan su partición: el test sigue sin ver nada entrenado
+    (p_train, y_train), (p_val, y_val), (p_test, y_test) = stable_split(args.base, cache, paths, labels)
+else:
+    (p_train, y_train), (p_val, y_val), (p_test, y_test) = split_paths(paths, labels)
+p_fit, y_fit = p_train, y_train
+if args.incremental:
+    # el coste depende de cuántas imágenes son nuevas, no del tamaño total del dataset
+    p_fit, y_fit, n_new = incremental_split(args.base, cache, p_train, y_train, args.replay)
+    if n_new == 0:
+        raise SystemExit(f"✅ No hay imágenes nuevas: {args.base} está al día")
 
-# ---------- Data Augmentation ----------
-data_augmentation = tf.keras.Sequential([
-    tf.keras.layers.RandomFlip("horizontal"),
-    tf.keras.layers.RandomRotation(0.05),
-    tf.keras.layers.RandomZoom(0.1),
-    tf.keras.layers.RandomContrast(0.1),
-])
-
-# ---------- Modelo base ----------
-base_model = tf.keras.applications.MobileNetV2(
-    input_shape=(224,224,3), include_top=False, weights='imagenet'
-)
-base_model.trainable = False  # congelar pesos de ImageNet
+# ---------- Pipeline de entrada (streaming: decodifica en paralelo con prefetch) ----------
+if args.incremental:
+    # la entrada la decide el .h5 de partida (con o sin Rescaling), no el valor actual de NORMALIZE_IN_MODEL
+    model, base_model, head = load_trained(args.base)
+    normalize = not model_normalizes_input(model)
+else:
+    normalize = not NORMALIZE_IN_MODEL
+train_ds = make_dataset(p_fit, y_fit, batch_size=32, shuffle=True, cache=cache, normalize=normalize)
+val_ds = make_dataset(p_val, y_val, batch_size=32, cache=cache, normalize=normalize)
+test_ds = make_dataset(p_test, y_test, batch_size=32, cache=cache, normalize=normalize)
+
+# --incremental: el modelo ya se cargó arriba (mismo backbone congelado, augmentation y cabeza ya entrenada), se ajusta con un learning rate menor
+if not args.incremental:
+    # ---------- Data Augmentation ----------
+    data_augmentation = tf.keras.Sequential([
+        tf.keras.layers.RandomFlip("horizontal"),
+        tf.keras.layers.RandomRotation(0.05),
+        tf.keras.layers.RandomZoom(0.1),
+        tf.keras.layers.RandomContrast(0.1),
+    ])
 
-# ---------- Construcción del modelo ----------
-model = tf.keras.Sequential([
-    data_augmentation,
-    base_model,
-    tf.keras.layers.GlobalAveragePooling2D(),
-    tf.keras.layers.Dense(128, activation='relu'),
-    tf.keras.layers.Dropout(0.3),  # ayuda a generalizar
-    tf.keras.layers.Dense(1, activation='sigmoid')
-])
+    # ---------- Modelo base ----------
+    base_model = tf.keras.applications.MobileNetV2(
+        input_shape=(224,224,3), include_top=False, weights='imagenet'
+    )
 
-model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    # ---------- Construcción del modelo ----------
+    # Con NORMALIZE_IN_MODEL la entrada son píxeles 0-255 y se escala dentro del grafo
+    preprocess = [tf.keras.layers.Rescaling(1./255)] if NORMALIZE_IN_MODEL else []
+
+    head = [
+        tf.keras.layers.Dense(128, activation='relu'),
+        tf.keras.layers.Dropout(0.3),  # ayuda a generalizar
+        tf.keras.layers.Dense(1, activation='sigmoid')
+    ]
+
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(224,224,3)),
+        *preprocess,
+        data_augmentation,
+        base_model,
+        tf.keras.layers.GlobalAveragePooling2D(),
+        *head
+    ])
+base_model.trainable = False  # congelar pesos de ImageNet
+
+learning_rate = FINE_TUNE_LR if args.incremental else 1e-3  # 1e-3 = 'adam' por defecto
+epochs = FINE_TUNE_EPOCHS if args.incremental else EPOCHS
+model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate), loss='binary_crossentropy', metrics=['accuracy'])
 
 # ---------- Balanceo de clases ----------
 class_weights = compute_class_weight(
     "balanced",
-    classes=np.unique(y_train),
-    y=y_train
+    classes=np.unique(y_fit),
+    y=y_fit
 )
 class_weights = dict(enumerate(class_weights))
 print(f"⚖️ Class Weights: {class_weights}")
 
 # ---------- Entrenar ----------
-history = model.fit(
-    X_train, y_train,
-    validation_split=0.2,
-    epochs=15,
-    batch_size=32,
-    class_weight=class_weights
-)
+if USE_EMBEDDINGS:
+    # MobileNetV2 corre una sola vez por imagen; la cabeza entrena sobre vectores de 1280
+    emb_cache = EmbeddingCache(CACHE_DIR)
+    emb_cache.update(cache, paths, build_extractor(base_model))
+    X_train, y_train_e = emb_cache.load(cache, p_fit, y_fit)
+    X_val, y_val_e = emb_cache.load(cache, p_val, y_val)
+
+    # mismas capas (mismos pesos) que la cabeza de `model`
+    head_model = tf.keras.Sequential([tf.keras.Input(shape=(X_train.shape[1],)), *head])
+    head_model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate), loss='binary_crossentropy', metrics=['accuracy'])
+    history = head_model.fit(
+        X_train, y_train_e,
+        validation_data=(X_val, y_val_e),
+        epochs=epochs,
+        batch_size=32,
+        class_weight=class_weights,
+        # checkpoint por época (pesos + optimizador) para poder seguir con --resume
+        callbacks=[checkpoint_callback(CACHE_DIR, "nose_head" + ("_incremental" if args.incremental else ""), args.resume)]
+    )
+else:
+    history = model.fit(
+        train_ds,
+        validation_data=val_ds,
+        epochs=epochs,
+        class_weight=class_weights,
+        callbacks=[checkpoint_callback(CACHE_DIR, "nose_full" + ("_incremental" if args.incremental else ""), args.resume)]
+    )
 
 # ---------- Guardar para TFJS ----------
-model.save("burn_class_model_tfjs.h5")
+model.save(MODEL_PATH)
 print("💾 Guardado en formato .h5 listo para TFJS")
+if cache is not None:
+    # partición de este modelo (train incluye lo ya visto por el base): referencia para el siguiente --incremental
+    save_split(MODEL_PATH, cache, ((p_train, y_train), (p_val, y_val), (p_test, y_test)))
 
 # ---------- Evaluar ----------
-loss, acc = model.evaluate(X_test, y_test)
+loss, acc = model.evaluate(test_ds)
 print(f"🎯 Test Accuracy: {acc*100:.2f}%")
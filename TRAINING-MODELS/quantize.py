@@ -0,0 +1,136 @@
+import os
+import time
+import shutil
+import numpy as np
+import tensorflow as tf
+
+try:
+    import tensorflowjs as tfjs
+except ImportError:  # pip install tensorflowjs
+    tfjs = None
+
+# Variantes TFJS: los pesos se guardan cuantizados y el navegador los descuantiza al cargar
+TFJS_VARIANTS = {"float32": None, "float16": {"float16": "*"}, "uint8": {"uint8": "*"}}
+LATENCY_RUNS = 50
+
+def dir_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+# ---------- TFJS (layers-model, pesos float32 / float16 / uint8) ----------
+def export_tfjs(model, out_dir, dtype="float32"):
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tfjs.converters.save_keras_model(model, out_dir, quantization_dtype_map=TFJS_VARIANTS[dtype])
+
+def load_tfjs(out_dir):
+    """Keras con los pesos ya descuantizados: calcula exactamente lo que calcula TFJS"""
+    return tfjs.converters.load_keras_model(os.path.join(out_dir, "model.json"))
+
+# ---------- TFLite ----------
+def export_tflite(model, path, calibration=None, input_type=tf.float32, input_scale=None):
+    """Sin calibration: float32. Con calibration: cuantización entera completa (int8),
+    con rangos de activación medidos sobre esas muestras."""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if calibration is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([scaled(x[None], input_scale)] for x in calibration)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # uint8 para imágenes 0-255 (el modelo trae Rescaling); la salida queda en float32
+        converter.inference_input_type = input_type
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+
+class TFLiteModel:
+    """Intérprete TFLite con la misma interfaz que usamos de Keras (predict por lotes)"""
+
+    def __init__(self, path, num_threads=1):
+        self.interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch = None
+
+    def _prepare(self, x):
+        if self.input["dtype"] in (np.float32, np.float64):
+            return x.astype(self.input["dtype"])
+        scale, zero_point = self.input["quantization"]
+        if x.dtype == self.input["dtype"] and (scale, zero_point) == (1.0, 0):
+            return x
+        info = np.iinfo(self.input["dtype"])
+        return np.clip(np.rint(x / scale + zero_point), info.min, info.max).astype(self.input["dtype"])
+
+    def __call__(self, x):
+        if self._batch != len(x):
+            self.interpreter.resize_tensor_input(self.input["index"], [len(x), *self.input["shape"][1:]])
+            self.interpreter.allocate_tensors()
+            self._batch = len(x)
+        self.interpreter.set_tensor(self.input["index"], self._prepare(x))
+        self.interpreter.invoke()
+        out = self.interpreter.get_tensor(self.output["index"])
+        if self.output["dtype"] not in (np.float32, np.float64):
+            scale, zero_point = self.output["quantization"]
+            out = (out.astype(np.float32) - zero_point) * scale
+        return out
+
+    def predict(self, X, batch_size=32):
+        return np.concatenate([self(X[i:i + batch_size]) for i in range(0, len(X), batch_size)])
+
+# ---------- Métricas ----------
+def scaled(x, input_scale=None):
+    """Lote en float32 (p. ej. uint8 * 1/255): se convierte lote a lote, nunca el conjunto entero"""
+    x = x.astype(np.float32)
+    return x if input_scale is None else x * np.float32(input_scale)
+
+def accuracy(predict, X, y, batch_size=32, input_scale=None):
+    scores = np.concatenate([np.asarray(predict(scaled(X[i:i + batch_size], input_scale))).reshape(-1)
+                             for i in range(0, len(X), batch_size)])
+    return float(np.mean((scores > 0.5).astype(int) == np.asarray(y).reshape(-1)))
+
+def latency_ms(predict, x, runs=LATENCY_RUNS):
+    """Mediana de una inferencia de 1 muestra en CPU (tras calentar)"""
+    x = x[None]
+    predict(x)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        predict(x)
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+# ---------- Exportar todo + informe ----------
+def export_quantized(model, out_dir, name, calibration, X_eval, y_eval, input_type=tf.float32, input_scale=None):
+    """Genera TFJS float32/float16/uint8 y TFLite float32/int8 en out_dir e imprime
+    tamaño, latencia en CPU y accuracy de cada variante frente al modelo float.
+    input_scale: calibration y X_eval pueden llegar en uint8 y escalarse por lotes (p. ej. 1/255)."""
+    os.makedirs(out_dir, exist_ok=True)
+    keras_fn = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    keras_predict = lambda x: keras_fn(tf.convert_to_tensor(x, tf.float32)).numpy()
+    sample = scaled(X_eval[0], input_scale)
+    base_acc = accuracy(keras_predict, X_eval, y_eval, input_scale=input_scale)
+    rows = [("keras float32", None, latency_ms(keras_predict, sample), base_acc)]
+
+    if tfjs is None:
+        print("⚠️ tensorflowjs no está instalado: se omiten las variantes TFJS (pip install tensorflowjs)")
+    else:
+        for dtype in TFJS_VARIANTS:
+            path = os.path.join(out_dir, f"{name}_tfjs_{dtype}")
+            export_tfjs(model, path, dtype)
+            restored = load_tfjs(path)
+            acc = accuracy(lambda x: restored(x, training=False).numpy(), X_eval, y_eval, input_scale=input_scale)
+            # la latencia de TFJS depende del backend del navegador (WebGL/WASM): no se mide aquí
+            rows.append((f"tfjs {dtype}", dir_size(path), None, acc))
+
+    for label, calib in (("float32", None), ("int8", calibration)):
+        path = os.path.join(out_dir, f"{name}_{label}.tflite")
+        export_tflite(model, path, calib, input_type, input_scale)
+        tflite = TFLiteModel(path)
+        rows.append((f"tflite {label}", dir_size(path), latency_ms(tflite, sample),
+                     accuracy(tflite, X_eval, y_eval, input_scale=input_scale)))
+
+    print(f"\n📦 {name}: {len(X_eval)} muestras de evaluación, {len(calibration)} de calibración")
+    print(f"{'variante':<16}{'tamaño':>12}{'latencia':>12}{'accuracy':>10}{'Δ acc':>9}")
+    for variant, size, lat, acc in rows:
+        size_s = f"{size / 1024:.0f} KB" if size is not None else "-"
+        lat_s = f"{lat:.2f} ms" if lat is not None else "-"
+        print(f"{variant:<16}{size_s:>12}{lat_s:>12}{acc*100:>9.2f}%{(acc - base_acc)*100:>+8.2f}")
+    return rows
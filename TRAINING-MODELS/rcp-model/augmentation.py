@@ -1,16 +1,17 @@
 import os
-import numpy as np
-from tensorflow.keras.preprocessing.image import ImageDataGenerator, img_to_array, load_img
+import sys
+# augment.py es común a los tres modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from augment import BatchAugmenter, augment_folder
 
 # Ruta de entrada (imágenes originales)
 input_dir = r"C:\Users\estro\Desktop\rcp-model\datasests"
 
 # Ruta de salida (imágenes aumentadas)
 output_dir = r"C:\Users\estro\Desktop\rcp-model\datasests_augmented"
-os.makedirs(output_dir, exist_ok=True)
 
-# Configuración del data augmentation
-datagen = ImageDataGenerator(
+# Configuración del data augmentation (mismos rangos que el ImageDataGenerator anterior)
+augmenter = BatchAugmenter(
     rotation_range=40,        # rotaciones más grandes
     width_shift_range=0.2,    # mover más
     height_shift_range=0.2,
@@ -19,28 +20,13 @@ datagen = ImageDataGenerator(
     horizontal_flip=True,
     brightness_range=[0.5, 1.5],  # brillo variable
     channel_shift_range=30.0,     # cambiar colores
-    fill_mode='nearest'
+    seed=42                       # misma semilla -> mismas imágenes aumentadas
 )
 
-# Recorremos todas las imágenes originales
-for filename in os.listdir(input_dir):
-    if filename.lower().endswith(('.jpg', '.png', '.jpeg')):
-        img_path = os.path.join(input_dir, filename)
-        img = load_img(img_path, target_size=(224, 224))  
-        x = img_to_array(img)
-        x = x.reshape((1,) + x.shape)
+# 🔥 Generamos 20 versiones por imagen (ajusta si quieres más/menos)
+augment_per_image = 20
 
-        # 🔥 Generamos 20 versiones por imagen (ajusta si quieres más/menos)
-        i = 0
-        for batch in datagen.flow(
-            x, 
-            batch_size=1,
-            save_to_dir=output_dir,
-            save_prefix=filename.split('.')[0],
-            save_format='jpg'
-        ):
-            i += 1
-            if i >= 20:
-                break
+# Se procesan lotes de imágenes a 224x224 y los JPEG se escriben en segundo plano
+augment_folder(input_dir, output_dir, augmenter, augment_per_image, target_size=(224, 224))
 
 print("✅ Augmentation terminado. Revisa la carpeta:", output_dir)
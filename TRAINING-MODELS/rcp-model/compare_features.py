@@ -0,0 +1,62 @@
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import callbacks
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from keypoints_io import load_keypoints
+from keypoints_model import build_model, HIDDEN_RAW, HIDDEN_POSE
+from pose_features import pose_features, NUM_FEATURES
+
+# Mismo split y mismo entrenamiento que modeltrainer.py para las dos entradas
+base_dir = r"C:\Users\estro\Desktop\rcp-model"
+LATENCY_RUNS = 200
+
+def latency_ms(fn, x, runs=LATENCY_RUNS):
+    fn(x)  # calentamiento
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(x)
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+def train_and_measure(name, X_train, X_test, y_train, y_test, hidden, frame, features=None):
+    """frame = una fila de landmarks crudos: la latencia incluye calcular las features"""
+    scaler = StandardScaler()
+    model = build_model(X_train.shape[1], hidden)
+    model.fit(
+        scaler.fit_transform(X_train), y_train,
+        validation_split=0.15, epochs=200, batch_size=32, verbose=0,
+        callbacks=[callbacks.EarlyStopping(monitor="val_loss", patience=10, restore_best_weights=True)],
+    )
+    _, acc = model.evaluate(scaler.transform(X_test), y_test, verbose=0)
+
+    # por frame (batch 1): features (si hay) + scaler + modelo, como en la app
+    infer = tf.function(lambda x: model(x, training=False))
+    prep = features or (lambda X: X)
+    frame_ms = latency_ms(lambda x: infer(scaler.transform(prep(x)).astype(np.float32)).numpy(), frame)
+    model_ms = latency_ms(lambda x: infer(x).numpy(), scaler.transform(prep(frame)).astype(np.float32))
+    return name, X_train.shape[1], model.count_params(), acc, model_ms, frame_ms
+
+if __name__ == "__main__":
+    X, y = load_keypoints(os.path.join(base_dir, "keypoints_npy"), os.path.join(base_dir, "keypoints.csv"))
+    X_raw_train, X_raw_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    start = time.perf_counter()
+    F_train, F_test = pose_features(X_raw_train), pose_features(X_raw_test)
+    print(f"🦴 {NUM_FEATURES} features para {len(X)} filas en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rows = [
+        train_and_measure("132 crudos", X_raw_train, X_raw_test, y_train, y_test, HIDDEN_RAW, X_raw_test[:1]),
+        train_and_measure("pose_features", F_train, F_test, y_train, y_test, HIDDEN_POSE, X_raw_test[:1], pose_features),
+    ]
+
+    print(f"\n📊 Entrada cruda vs pose_features ({len(y_test)} filas de test)")
+    print(f"{'entrada':<16}{'dims':>6}{'red':>12}{'parámetros':>12}{'pesos':>9}{'accuracy':>10}{'modelo':>11}{'por frame':>12}")
+    for (name, dims, params, acc, model_ms, frame_ms), hidden in zip(rows, (HIDDEN_RAW, HIDDEN_POSE)):
+        net = "-".join(map(str, hidden))
+        print(f"{name:<16}{dims:>6}{net:>12}{params:>12,}{params * 4 / 1024:>6.1f} KB"
+              f"{acc*100:>9.2f}%{model_ms:>8.3f} ms{frame_ms:>9.3f} ms")
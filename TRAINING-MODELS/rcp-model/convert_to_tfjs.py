@@ -1,8 +1,52 @@
+import os
+import sys
+import joblib
+import numpy as np
 import tensorflowjs as tfjs
 import tensorflow as tf
+from sklearn.model_selection import train_test_split
+from keypoints_io import load_keypoints
+# quantize.py y graph_model.py son comunes a los tres modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from quantize import export_quantized
+from graph_model import export_graph_model, compare_tfjs
+
+base_dir = r"C:\Users\estro\Desktop\rcp-model"
+trained_dir = os.path.join(base_dir, "trained")
+
+# Además del TFJS float32, generar variantes cuantizadas (TFJS uint8/float16, TFLite int8) con su informe
+QUANTIZE = True
+CALIBRATION_SAMPLES = 500
+# Graph-model (ops fusionadas, shards de 1 MB) para tf.loadGraphModel, comparado con el layers-model
+GRAPH_MODEL = True
 
 # Cargar el modelo .h5
-model = tf.keras.models.load_model(r"C:\Users\estro\Desktop\rcp-model\trained\rcp_keypoints_model.h5")
+model = tf.keras.models.load_model(os.path.join(trained_dir, "rcp_keypoints_model.h5"))
 
 # Exportar a formato TensorFlow.js
-tfjs.converters.save_keras_model(model, r"C:\Users\estro\Desktop\rcp-model\trained\tfjs_model")
+tfjs.converters.save_keras_model(model, os.path.join(trained_dir, "tfjs_model"))
+
+# Variante con el scaler integrado (modeltrainer.py): la app le pasa los landmarks sin normalizar
+raw_model_path = os.path.join(trained_dir, "rcp_keypoints_model_raw.h5")
+if os.path.exists(raw_model_path):
+    raw_model = tf.keras.models.load_model(raw_model_path)
+    tfjs.converters.save_keras_model(raw_model, os.path.join(trained_dir, "tfjs_model_raw"))
+
+if GRAPH_MODEL:
+    export_graph_model(model, os.path.join(trained_dir, "tfjs_graph_model"))
+    compare_tfjs(os.path.join(trained_dir, "tfjs_model"), os.path.join(trained_dir, "tfjs_graph_model"))
+
+if QUANTIZE:
+    # Mismo split y mismo scaler que modeltrainer.py: calibración con train, evaluación con test
+    X, y = load_keypoints(os.path.join(base_dir, "keypoints_npy"), os.path.join(base_dir, "keypoints.csv"))
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    scaler = joblib.load(os.path.join(trained_dir, "scaler.save"))
+    rng = np.random.default_rng(42)
+    calib_idx = rng.choice(len(X_train), min(CALIBRATION_SAMPLES, len(X_train)), replace=False)
+    calibration = scaler.transform(X_train[np.sort(calib_idx)]).astype(np.float32)
+    X_eval = scaler.transform(X_test).astype(np.float32)
+
+    export_quantized(model, os.path.join(trained_dir, "quantized"), "rcp_keypoints",
+                     calibration, X_eval, y_test)
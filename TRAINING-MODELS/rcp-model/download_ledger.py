@@ -0,0 +1,82 @@
+import os
+import time
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url        TEXT PRIMARY KEY,
+    dest       TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'pending',  -- pending | done | retry | failed
+    http_code  INTEGER,
+    bytes      INTEGER,
+    sha256     TEXT,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    error      TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path  TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL
+);
+"""
+
+# Resultado del Downloader -> estado en el ledger
+STATUS_MAP = {"ok": "done", "exists": "done", "failed": "failed", "retry": "retry"}
+
+class DownloadLedger:
+    """Registro persistente (SQLite) de cada URL: estado, código HTTP, bytes, hash e intentos"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    # ---------- Fuentes (.txt con URLs) ----------
+    def source_changed(self, path):
+        row = self.conn.execute("SELECT mtime FROM sources WHERE path = ?", (path,)).fetchone()
+        return row is None or row[0] != os.stat(path).st_mtime_ns
+
+    def mark_source(self, path):
+        self.conn.execute("INSERT OR REPLACE INTO sources (path, mtime) VALUES (?, ?)",
+                          (path, os.stat(path).st_mtime_ns))
+
+    # ---------- Trabajos ----------
+    def add(self, jobs):
+        """jobs: (url, dest). Las URLs ya registradas conservan su estado"""
+        self.conn.executemany("INSERT OR IGNORE INTO jobs (url, dest) VALUES (?, ?)", jobs)
+        self.conn.commit()
+
+    def sync_with_disk(self):
+        """Lo que ya está en disco (p. ej. de antes del ledger) cuenta como hecho;
+        lo marcado como hecho pero borrado de disco vuelve a pendiente"""
+        rows = self.conn.execute("SELECT url, dest, status FROM jobs").fetchall()
+        found = [(os.path.getsize(dest), time.time(), url)
+                 for url, dest, status in rows if status != "done" and os.path.exists(dest)]
+        missing = [(url,) for url, dest, status in rows if status == "done" and not os.path.exists(dest)]
+        self.conn.executemany("UPDATE jobs SET status = 'done', bytes = ?, updated_at = ? WHERE url = ?", found)
+        self.conn.executemany("UPDATE jobs SET status = 'pending', attempts = 0 WHERE url = ?", missing)
+        self.conn.commit()
+        return len(found), len(missing)
+
+    def pending(self, max_attempts):
+        return self.conn.execute(
+            "SELECT url, dest FROM jobs WHERE status = 'pending' "
+            "OR (status = 'retry' AND attempts < ?)", (max_attempts,)
+        ).fetchall()
+
+    def record(self, result):
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, http_code = ?, bytes = ?, sha256 = COALESCE(?, sha256), "
+            "attempts = attempts + ?, error = ?, updated_at = ? WHERE url = ?",
+            (STATUS_MAP[result.status], result.http_code, result.bytes, result.sha256,
+             result.attempts, result.error, time.time(), result.url),
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def summary(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
@@ -1,7 +1,12 @@
 import os
-import csv
+import json
+import time
+import hashlib
 import cv2
+import numpy as np
 import mediapipe as mp
+from multiprocessing import Pool
+from keypoints_io import FEATURE_COLUMNS, write_csv, write_npy, write_frames_index, write_frames_csv
 
 # Rutas de las carpetas
 base_dir = r"C:\Users\estro\Desktop\rcp-model"
@@ -11,46 +16,297 @@ folders = {
 }
 
 output_csv = os.path.join(base_dir, "keypoints.csv")
+# Formato binario para modeltrainer.py (X.npy float32 + y.npy, se lee con mmap)
+output_npy = os.path.join(base_dir, "keypoints_npy")
+OUTPUT_FORMATS = ("npy", "csv")  # el CSV queda como exportación para inspección
+# Registro de imágenes ya procesadas (tamaño, mtime, hash, etiqueta y resultado)
+manifest_path = os.path.join(base_dir, "keypoints_manifest.json")
+# Landmarks de las imágenes del manifest (float32): "row" de cada entrada = fila de este .npy
+manifest_rows_path = os.path.join(base_dir, "keypoints_manifest_rows.npy")
 
-# Inicializar MediaPipe Pose
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(static_image_mode=True, min_detection_confidence=0.5)
+# Solo procesar imágenes nuevas o modificadas; False = rehacer todo
+INCREMENTAL = True
 
-# Crear CSV con encabezado
-num_keypoints = 33
-header = []
-for i in range(num_keypoints):
-    header += [f"x{i}", f"y{i}", f"z{i}", f"v{i}"]
-header.append("label")  # etiqueta (RCP=1 / NoRCP=0)
+# "images" = carpetas de fotos (static_image_mode=True: detector de persona en cada imagen)
+# "videos" = carpetas de vídeo leídas con OpenCV: Pose en modo seguimiento, el detector
+#            solo vuelve a correr cuando se pierde a la persona
+MODE = "images"
+video_folders = {
+    "SI-RCP-videos": 1,
+    "NO-RCP-videos": 0
+}
+VIDEO_EXTS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+FRAME_STRIDE = 3   # procesar 1 de cada N frames
+SAMPLE_FPS = None  # o muestrear por tiempo (p. ej. 10 = 10 frames por segundo de vídeo); manda sobre FRAME_STRIDE
+output_video_csv = os.path.join(base_dir, "keypoints_video.csv")
+output_video_npy = os.path.join(base_dir, "keypoints_video_npy")  # + frames.csv (video_id, frame, timestamp_ms)
+video_manifest_path = os.path.join(base_dir, "keypoints_video_manifest.json")
+# Un <sha1>.npy por vídeo con sus frames con pose; el manifest solo guarda metadatos
+video_frames_dir = os.path.join(base_dir, "keypoints_video_frames")
+FRAME_DTYPE = np.dtype([("frame", np.int32), ("timestamp_ms", np.float64),
+                        ("landmarks", np.float32, (len(FEATURE_COLUMNS),))])
+
+# Procesos en paralelo (cada uno con su propia instancia de MediaPipe Pose)
+NUM_WORKERS = os.cpu_count() or 1
+CHUNK_SIZE = 8  # imágenes que se envían juntas a cada proceso
+
+# ---------- Worker: una instancia de Pose por proceso ----------
+pose = None
+
+def init_worker():
+    global pose
+    mp_pose = mp.solutions.pose
+    pose = mp_pose.Pose(static_image_mode=True, min_detection_confidence=0.5)
+
+def extract_keypoints(task):
+    img_path, label = task
+
+    # Leer imagen
+    image = cv2.imread(img_path)
+    if image is None:
+        return img_path, label, None, "unreadable"
+
+    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    results = pose.process(image_rgb)
+    if not results.pose_landmarks:
+        return img_path, label, None, "no_pose"
+
+    return img_path, label, landmarks(results), "ok"
+
+def landmarks(results):
+    row = []
+    for lm in results.pose_landmarks.landmark:
+        row += [lm.x, lm.y, lm.z, lm.visibility]
+    return row
+
+def extract_video(task):
+    """Frames muestreados de un vídeo -> array FRAME_DTYPE con los que tienen pose"""
+    video_path, label = task
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return video_path, label, None, "unreadable", 0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step_ms = 1000.0 / SAMPLE_FPS if SAMPLE_FPS else None
+    frames, processed, idx, next_ms = [], 0, 0, 0.0
+    # Pose nuevo por vídeo: el seguimiento no arrastra a la persona del vídeo anterior
+    with mp.solutions.pose.Pose(static_image_mode=False, min_detection_confidence=0.5,
+                                min_tracking_confidence=0.5) as video_pose:
+        while cap.grab():  # los frames saltados no se convierten a BGR
+            timestamp_ms = idx * 1000.0 / fps
+            if step_ms is None:
+                take = idx % FRAME_STRIDE == 0
+            else:
+                take = timestamp_ms >= next_ms
+                while next_ms <= timestamp_ms:
+                    next_ms += step_ms
+            if take:
+                ok, image = cap.retrieve()
+                if ok:
+                    results = video_pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                    processed += 1
+                    if results.pose_landmarks:
+                        frames.append((idx, round(timestamp_ms, 1), landmarks(results)))
+            idx += 1
+    cap.release()
+    frames = np.array(frames, dtype=FRAME_DTYPE)
+    return video_path, label, frames, "ok" if len(frames) else "no_pose", processed
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# ---------- Manifest ----------
+def load_manifest(path=manifest_path):
+    if not INCREMENTAL or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(manifest, path=manifest_path):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+def save_array(arr, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, arr)
+    os.replace(path + ".tmp", path)
 
-with open(output_csv, mode="w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(header)
+def load_manifest_rows(manifest):
+    if not manifest or not os.path.exists(manifest_rows_path):
+        return None
+    return np.load(manifest_rows_path, mmap_mode="r")
 
-    # Procesar imágenes de ambas carpetas
+def manifest_row(entry, rows):
+    # manifests anteriores guardaban la fila (landmarks + etiqueta) como lista dentro del JSON
+    return entry["row"][:-1] if isinstance(entry["row"], list) else rows[entry["row"]]
+
+def video_frames_path(entry):
+    return os.path.join(video_frames_dir, f"{entry['sha1']}.npy")
+
+def reuse_entry(entry, img_path, label):
+    """Devuelve la entrada (actualizada) si la imagen no cambió, o None"""
+    if entry is None or entry["label"] != label:
+        return None
+    st = os.stat(img_path)
+    if entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns:
+        return entry
+    # cambió el mtime pero quizás no el contenido (copia, touch...)
+    if entry["size"] == st.st_size and entry["sha1"] == file_hash(img_path):
+        return dict(entry, mtime=st.st_mtime_ns)
+    return None
+
+def new_entry(img_path, label, row, status):
+    st = os.stat(img_path)
+    return {
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        "sha1": file_hash(img_path),
+        "label": label,
+        "status": status,  # ok / no_pose / unreadable: los fallidos tampoco se reintentan
+        "row": row,
+    }
+
+# ---------- Tareas: imágenes (o vídeos) de ambas carpetas, en orden ----------
+def list_tasks(folders=folders, exts=('.jpg', '.png', '.jpeg')):
+    tasks = []
     for folder_name, label in folders.items():
         folder_path = os.path.join(base_dir, folder_name)
         for filename in os.listdir(folder_path):
-            if filename.lower().endswith(('.jpg', '.png', '.jpeg')):
-                img_path = os.path.join(folder_path, filename)
-                
-                # Leer imagen
-                image = cv2.imread(img_path)
-                if image is None:
-                    print(f"⚠️ No se pudo leer {filename}")
-                    continue
+            if filename.lower().endswith(exts):
+                tasks.append((os.path.join(folder_path, filename), label))
+    return tasks
+
+def split_pending(tasks, old_manifest):
+    """(manifest con las entradas reutilizables, tareas pendientes, nº de archivos eliminados)"""
+    manifest = {}
+    pending = []
+    for path, label in tasks:
+        key = os.path.relpath(path, base_dir)
+        entry = reuse_entry(old_manifest.get(key), path, label)
+        if entry is None:
+            pending.append((path, label))
+        else:
+            manifest[key] = entry
+    removed = len(set(old_manifest) - {os.path.relpath(p, base_dir) for p, _ in tasks})
+    return manifest, pending, removed
 
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                results = pose.process(image_rgb)
+def extract_images():
+    tasks = list_tasks()
+    old_manifest = load_manifest()
+    old_rows = load_manifest_rows(old_manifest)
+    if old_rows is None:
+        # sin el .npy de filas solo sirven las entradas sin pose o con la fila aún en el JSON
+        old_manifest = {k: e for k, e in old_manifest.items() if not isinstance(e["row"], int)}
+    manifest, pending, removed = split_pending(tasks, old_manifest)
+    new_rows = {}
+    print(f"📂 {len(tasks)} imágenes: {len(pending)} nuevas o modificadas, "
+          f"{len(manifest)} sin cambios, {removed} eliminadas ({NUM_WORKERS} procesos)")
+    start = time.perf_counter()
 
-                if results.pose_landmarks:
-                    row = []
-                    for lm in results.pose_landmarks.landmark:
-                        row += [lm.x, lm.y, lm.z, lm.visibility]
-                    row.append(label)
-                    writer.writerow(row)
+    if pending:
+        with Pool(NUM_WORKERS, initializer=init_worker) as pool:
+            for img_path, label, row, status in pool.imap(extract_keypoints, pending, chunksize=CHUNK_SIZE):
+                filename = os.path.basename(img_path)
+                key = os.path.relpath(img_path, base_dir)
+                manifest[key] = new_entry(img_path, label, None, status)
+                if status == "ok":
+                    new_rows[key] = row
                     print(f"✅ Procesada: {filename}")
+                elif status == "unreadable":
+                    print(f"⚠️ No se pudo leer {filename}")
                 else:
                     print(f"⚠️ No se detectó pose en {filename}")
 
-print("✅ Extracción de keypoints terminada. CSV guardado en:", output_csv)
+    # Las salidas se reescriben desde el manifest en el orden de las carpetas:
+    # mismo contenido que una extracción completa y sin filas de archivos borrados
+    keys = [k for k in (os.path.relpath(p, base_dir) for p, _ in tasks) if manifest[k]["status"] == "ok"]
+    X = np.empty((len(keys), len(FEATURE_COLUMNS)), dtype=np.float32)
+    for i, key in enumerate(keys):
+        X[i] = new_rows[key] if key in new_rows else manifest_row(manifest[key], old_rows)
+        manifest[key]["row"] = i
+    y = np.array([manifest[k]["label"] for k in keys], dtype=np.int32)  # etiqueta (RCP=1 / NoRCP=0)
+    save_array(X, manifest_rows_path)
+    save_manifest(manifest)
+    if "npy" in OUTPUT_FORMATS:
+        write_npy(output_npy, X, y)
+        print("💾 Keypoints binarios guardados en:", output_npy)
+    if "csv" in OUTPUT_FORMATS:
+        write_csv(output_csv, X, y)
+        print("💾 CSV guardado en:", output_csv)
+
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ {len(pending)} imágenes en {elapsed:.1f}s ({len(pending) / max(elapsed, 1e-9):.1f} img/s)")
+
+def extract_videos():
+    tasks = list_tasks(video_folders, VIDEO_EXTS)
+    manifest, pending, removed = split_pending(tasks, load_manifest(video_manifest_path))
+    # si cambia el muestreo, los vídeos ya procesados no sirven
+    sampling = {"stride": FRAME_STRIDE, "fps": SAMPLE_FPS}
+    # (ni los que no tienen su .npy, p. ej. de manifests que guardaban los frames en el JSON)
+    stale = [k for k, e in manifest.items() if e.get("sampling") != sampling
+             or (e["status"] == "ok" and not os.path.exists(video_frames_path(e)))]
+    pending += [(os.path.join(base_dir, k), manifest.pop(k)["label"]) for k in stale]
+    print(f"🎞️ {len(tasks)} vídeos: {len(pending)} por procesar, "
+          f"{len(manifest)} sin cambios, {removed} eliminados ({NUM_WORKERS} procesos)")
+    start = time.perf_counter()
+    processed = 0
+
+    if pending:
+        # un vídeo por tarea: el seguimiento necesita sus frames en orden dentro del mismo proceso
+        with Pool(min(NUM_WORKERS, len(pending))) as pool:
+            for video_path, label, frames, status, n in pool.imap_unordered(extract_video, pending):
+                filename = os.path.basename(video_path)
+                processed += n
+                entry = dict(new_entry(video_path, label, None, status), frames=len(frames), sampling=sampling)
+                manifest[os.path.relpath(video_path, base_dir)] = entry
+                if status == "ok":
+                    save_array(frames, video_frames_path(entry))
+                    print(f"✅ Procesado: {filename} ({len(frames)}/{n} frames con pose)")
+                elif status == "unreadable":
+                    print(f"⚠️ No se pudo abrir {filename}")
+                else:
+                    print(f"⚠️ No se detectó pose en {filename} ({n} frames)")
+    save_manifest(manifest, video_manifest_path)
+    # .npy de vídeos borrados o modificados
+    keep = {os.path.basename(video_frames_path(e)) for e in manifest.values() if e["status"] == "ok"}
+    if os.path.isdir(video_frames_dir):
+        for name in set(os.listdir(video_frames_dir)) - keep:
+            os.remove(os.path.join(video_frames_dir, name))
+
+    index, arrays, labels = [], [], []
+    for path, _ in tasks:
+        key = os.path.relpath(path, base_dir)
+        entry = manifest[key]
+        if entry["status"] != "ok":
+            continue
+        frames = np.load(video_frames_path(entry))
+        index += [(key, int(f), float(t)) for f, t in zip(frames["frame"], frames["timestamp_ms"])]
+        arrays.append(frames["landmarks"])
+        labels.append(np.full(len(frames), entry["label"], dtype=np.int32))
+    X = np.concatenate(arrays) if arrays else np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32)
+    y = np.concatenate(labels) if labels else np.empty(0, dtype=np.int32)
+    if "npy" in OUTPUT_FORMATS:
+        write_npy(output_video_npy, X, y)
+        write_frames_index(output_video_npy, index)
+        print("💾 Keypoints binarios guardados en:", output_video_npy)
+    if "csv" in OUTPUT_FORMATS:
+        write_frames_csv(output_video_csv, index, X, y)
+        print("💾 CSV guardado en:", output_video_csv)
+
+    elapsed = time.perf_counter() - start
+    workers = min(NUM_WORKERS, len(pending)) or 1
+    print(f"⏱️ {processed} frames en {elapsed:.1f}s ({processed / max(elapsed, 1e-9):.1f} frames/s, "
+          f"{elapsed * workers / max(processed, 1) * 1000:.1f} ms por frame y proceso)")
+
+if __name__ == "__main__":
+    if MODE == "videos":
+        extract_videos()
+    else:
+        extract_images()
+    print("✅ Extracción de keypoints terminada.")
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import random
+import shutil
+import hashlib
+import itertools
+import numpy as np
+import joblib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Manager, get_context
+import tensorflow as tf
+from tensorflow.keras import callbacks
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from keypoints_io import load_keypoints
+from keypoints_model import build_model
+from pose_features import pose_features
+
+# Rutas (las de modeltrainer.py)
+base_dir = r"C:\Users\estro\Desktop\rcp-model"
+trained_dir = os.path.join(base_dir, "trained")
+# Un JSON (+ .h5) por prueba, con nombre = hash de la configuración y de los datos:
+# volver a lanzar la búsqueda solo entrena las combinaciones que faltan
+RESULTS_DIR = os.path.join(trained_dir, "hpsearch")
+
+SEARCH_SPACE = {
+    "features": ["raw", "pose"],
+    "hidden": [[256, 128, 64], [128, 64, 32], [64, 32, 16], [64, 32], [32, 16]],
+    "dropout": [[0.0, 0.0], [0.2, 0.1], [0.3, 0.25], [0.4, 0.3]],
+    "learning_rate": [3e-4, 1e-3, 3e-3],
+    "batch_size": [16, 32, 64, 128],
+}
+N_TRIALS = 40  # combinaciones al azar (semilla fija) de todo el espacio
+SEED = 42
+
+# Cada entrenamiento usa un hilo: el MLP es tan pequeño que se aprovecha mejor un proceso por núcleo
+NUM_WORKERS = os.cpu_count() or 1
+MAX_EPOCHS = 200
+PATIENCE = 10  # EarlyStopping de modeltrainer.py
+# Parada por mediana: desde GRACE_EPOCHS, una prueba cuya mejor val_loss sea peor que la mediana
+# de las demás en la misma época se corta (hacen falta al menos MIN_TRIALS curvas para comparar)
+GRACE_EPOCHS = 10
+MIN_TRIALS = 3
+LATENCY_RUNS = 200
+
+def config_key(config, fingerprint):
+    blob = json.dumps({"config": config, "data": fingerprint}, sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+def data_fingerprint(X, y):
+    h = hashlib.sha1(np.ascontiguousarray(X).tobytes())
+    h.update(np.ascontiguousarray(y).tobytes())
+    return h.hexdigest()
+
+def sample_configs(n=N_TRIALS, seed=SEED):
+    grid = [dict(zip(SEARCH_SPACE, values)) for values in itertools.product(*SEARCH_SPACE.values())]
+    return grid if len(grid) <= n else random.Random(seed).sample(grid, n)
+
+# ---------- Datos: mismo split que modeltrainer.py, validación apartada del train ----------
+def load_splits(features):
+    X, y = load_keypoints(os.path.join(base_dir, "keypoints_npy"), os.path.join(base_dir, "keypoints.csv"))
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    X_train, X_val, y_train, y_val = train_test_split(
+        X_train, y_train, test_size=0.15, random_state=42, stratify=y_train
+    )
+    if features == "pose":
+        X_train, X_val, X_test = pose_features(X_train), pose_features(X_val), pose_features(X_test)
+    scaler = StandardScaler().fit(X_train)
+    return scaler, [(scaler.transform(X_), y_) for X_, y_ in ((X_train, y_train), (X_val, y_val), (X_test, y_test))]
+
+# ---------- Worker ----------
+_splits = {}
+
+def init_worker():
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def get_splits(features):
+    if features not in _splits:
+        _splits[features] = load_splits(features)
+    return _splits[features]
+
+class MedianStopping(callbacks.Callback):
+    """Publica la mejor val_loss por época en `curves` (compartido entre procesos) y corta la
+    prueba si va peor que la mediana de las demás"""
+
+    def __init__(self, key, curves):
+        super().__init__()
+        self.key, self.curves = key, curves
+        self.curve, self.pruned_at = [], None
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.curve.append(min(logs["val_loss"], self.curve[-1] if self.curve else np.inf))
+        self.curves[self.key] = list(self.curve)
+        if epoch + 1 < GRACE_EPOCHS:
+            return
+        others = [c[epoch] for k, c in self.curves.items() if k != self.key and len(c) > epoch]
+        if len(others) >= MIN_TRIALS and self.curve[-1] > np.median(others):
+            self.pruned_at = epoch + 1
+            self.model.stop_training = True
+
+def run_trial(config, key, curves, model_path):
+    tf.keras.utils.set_random_seed(SEED)
+    _, ((X_train, y_train), (X_val, y_val), _) = get_splits(config["features"])
+    model = build_model(X_train.shape[1], config["hidden"], config["dropout"], config["learning_rate"])
+    median = MedianStopping(key, curves)
+    start = time.perf_counter()
+    model.fit(
+        X_train, y_train,
+        validation_data=(X_val, y_val),
+        epochs=MAX_EPOCHS,
+        batch_size=config["batch_size"],
+        callbacks=[callbacks.EarlyStopping(monitor="val_loss", patience=PATIENCE, restore_best_weights=True), median],
+        verbose=0
+    )
+    val_loss, val_acc = model.evaluate(X_val, y_val, verbose=0)
+    curve = median.curve
+    if median.pruned_at is None:
+        # terminada: su mejor val_loss ya no cambia, sirve de referencia para cualquier época
+        curve = curve + [curve[-1]] * (MAX_EPOCHS - len(curve))
+        curves[key] = curve
+        model.save(model_path)
+    return {
+        "key": key, "config": config, "val_loss": float(val_loss), "val_accuracy": float(val_acc),
+        "epochs": len(median.curve), "pruned_at": median.pruned_at, "params": model.count_params(),
+        "seconds": round(time.perf_counter() - start, 2), "curve": curve,
+    }
+
+# ---------- Informe y exportación del mejor ----------
+def latency_ms(model, runs=LATENCY_RUNS):
+    infer = tf.function(lambda x: model(x, training=False))
+    x = tf.zeros([1, *model.input_shape[1:]])
+    infer(x)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        infer(x).numpy()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+def describe(config):
+    return (f"{config['features']:<5}{'-'.join(map(str, config['hidden'])):>12}"
+            f"{'/'.join(map(str, config['dropout'])):>10}{config['learning_rate']:>8g}{config['batch_size']:>6}")
+
+def export_best(best, model_path):
+    model = tf.keras.models.load_model(model_path)
+    scaler, (_, _, (X_test, y_test)) = load_splits(best["config"]["features"])
+    _, test_acc = model.evaluate(X_test, y_test, verbose=0)
+    name = "rcp_keypoints_model_best" if best["config"]["features"] == "raw" else "rcp_pose_model_best"
+    shutil.copyfile(model_path, os.path.join(trained_dir, f"{name}.h5"))
+    joblib.dump(scaler, os.path.join(trained_dir, f"{name}_scaler.save"))
+    summary = {
+        "config": best["config"], "key": best["key"],
+        "val_loss": best["val_loss"], "val_accuracy": best["val_accuracy"], "test_accuracy": float(test_acc),
+        "params": model.count_params(), "latency_ms": latency_ms(model),
+    }
+    with open(os.path.join(trained_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n🏆 Mejor configuración: {describe(best['config'])}")
+    print(f"   val acc {best['val_accuracy']*100:.2f}%, test acc {test_acc*100:.2f}%, "
+          f"{summary['params']:,} parámetros, {summary['latency_ms']:.3f} ms por frame (CPU, batch 1)")
+    print(f"💾 Guardado en {os.path.join(trained_dir, name)}.h5 (+ _scaler.save, .json)")
+
+if __name__ == "__main__":
+    os.makedirs(os.path.join(RESULTS_DIR, "models"), exist_ok=True)
+    X, y = load_keypoints(os.path.join(base_dir, "keypoints_npy"), os.path.join(base_dir, "keypoints.csv"))
+    fingerprint = data_fingerprint(X, y)
+    configs = sample_configs()
+
+    results, pending = {}, []
+    for config in configs:
+        key = config_key(config, fingerprint)
+        result_path = os.path.join(RESULTS_DIR, f"{key}.json")
+        if os.path.exists(result_path):
+            with open(result_path, "r", encoding="utf-8") as f:
+                results[key] = json.load(f)
+        else:
+            pending.append((config, key))
+    print(f"🔎 {len(configs)} configuraciones: {len(results)} en caché, {len(pending)} por entrenar ({NUM_WORKERS} procesos)")
+
+    start = time.perf_counter()
+    with Manager() as manager:
+        curves = manager.dict({key: r["curve"] for key, r in results.items()})
+        with ProcessPoolExecutor(NUM_WORKERS, mp_context=get_context("spawn"), initializer=init_worker) as executor:
+            futures = [executor.submit(run_trial, config, key, curves,
+                                       os.path.join(RESULTS_DIR, "models", f"{key}.h5"))
+                       for config, key in pending]
+            for future in as_completed(futures):
+                r = future.result()
+                results[r["key"]] = r
+                with open(os.path.join(RESULTS_DIR, f"{r['key']}.json"), "w", encoding="utf-8") as f:
+                    json.dump(r, f)
+                status = f"✂️ cortada en la época {r['pruned_at']}" if r["pruned_at"] else f"✅ {r['epochs']} épocas"
+                print(f"{describe(r['config'])}  val acc {r['val_accuracy']*100:6.2f}%  {status} ({r['seconds']:.0f}s)")
+    elapsed = time.perf_counter() - start
+    pruned = sum(1 for r in results.values() if r["pruned_at"])
+    print(f"⏱️ {len(pending)} pruebas en {elapsed:.0f}s, {pruned} cortadas por la mediana")
+
+    ranking = sorted((r for r in results.values() if not r["pruned_at"]),
+                     key=lambda r: (-r["val_accuracy"], r["val_loss"]))
+    print(f"\n{'entrada':<5}{'capas':>12}{'dropout':>10}{'lr':>8}{'batch':>6}{'val acc':>10}{'val loss':>10}{'parámetros':>12}")
+    for r in ranking[:10]:
+        print(f"{describe(r['config'])}{r['val_accuracy']*100:>9.2f}%{r['val_loss']:>10.4f}{r['params']:>12,}")
+    export_best(ranking[0], os.path.join(RESULTS_DIR, "models", f"{ranking[0]['key']}.h5"))
@@ -0,0 +1,86 @@
+import os
+import csv
+import json
+import numpy as np
+
+# Esquema fijo: 33 landmarks de MediaPipe Pose x (x, y, z, visibility) + label
+NUM_KEYPOINTS = 33
+FEATURE_COLUMNS = [f"{c}{i}" for i in range(NUM_KEYPOINTS) for c in "xyzv"]
+HEADER = FEATURE_COLUMNS + ["label"]
+FORMAT_VERSION = 1
+
+# ---------- Formato binario: X.npy (float32, N x 132) + y.npy (int32) ----------
+def _save_atomic(path, arr):
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, arr)
+    os.replace(path + ".tmp", path)
+
+def write_npy(out_dir, X, y):
+    X = np.asarray(X, dtype=np.float32).reshape(-1, len(FEATURE_COLUMNS))
+    y = np.asarray(y, dtype=np.int32)
+    os.makedirs(out_dir, exist_ok=True)
+    _save_atomic(os.path.join(out_dir, "X.npy"), X)
+    _save_atomic(os.path.join(out_dir, "y.npy"), y)
+    with open(os.path.join(out_dir, "schema.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": FORMAT_VERSION, "columns": FEATURE_COLUMNS,
+                   "dtype": "float32", "rows": int(len(X))}, f)
+
+def has_npy(out_dir):
+    return os.path.exists(os.path.join(out_dir, "schema.json"))
+
+def load_npy(out_dir, mmap=True):
+    """Devuelve (X, y) mapeados en memoria: no se parsea ni se copia nada"""
+    with open(os.path.join(out_dir, "schema.json"), "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    if schema["columns"] != FEATURE_COLUMNS:
+        raise ValueError(f"Esquema de keypoints inesperado en {out_dir}")
+    mode = "r" if mmap else None
+    X = np.load(os.path.join(out_dir, "X.npy"), mmap_mode=mode)
+    y = np.load(os.path.join(out_dir, "y.npy"), mmap_mode=mode)
+    return X, y
+
+def load_keypoints(npy_dir, csv_path):
+    """(X, y) desde el binario si existe, si no desde el CSV; sin filas con NaN"""
+    if has_npy(npy_dir):
+        X, y = load_npy(npy_dir)
+    else:
+        data = np.loadtxt(csv_path, delimiter=",", skiprows=1, dtype=np.float32, ndmin=2)
+        X, y = data[:, :-1], data[:, -1].astype(np.int32)
+    finite = np.isfinite(X).all(axis=1)
+    return (X, y) if finite.all() else (X[finite], y[finite])
+
+# ---------- CSV (exportación para inspección / compatibilidad) ----------
+def write_csv(path, X, y):
+    with open(path, mode="w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for row, label in zip(X, y):
+            # float32 -> float es exacto: mismos valores que escribe el extractor
+            writer.writerow([float(v) for v in row] + [int(label)])
+
+# ---------- Frames de vídeo: cada fila de X va acompañada de (video_id, frame, timestamp_ms) ----------
+FRAME_COLUMNS = ["video_id", "frame", "timestamp_ms"]
+
+def write_frames_index(out_dir, frames):
+    """frames.csv junto a X.npy/y.npy, en el mismo orden de filas"""
+    with open(os.path.join(out_dir, "frames.csv"), mode="w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FRAME_COLUMNS)
+        writer.writerows(frames)
+
+def write_frames_csv(path, frames, X, y):
+    with open(path, mode="w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FRAME_COLUMNS + HEADER)
+        for frame, row, label in zip(frames, X, y):
+            writer.writerow(list(frame) + [float(v) for v in row] + [int(label)])
+
+def csv_to_npy(csv_path, out_dir):
+    data = np.loadtxt(csv_path, delimiter=",", skiprows=1, dtype=np.float64, ndmin=2)
+    write_npy(out_dir, data[:, :-1], data[:, -1])
+    print(f"💾 {len(data)} filas convertidas a {out_dir}")
+
+if __name__ == "__main__":
+    # Convertir un keypoints.csv existente al formato binario
+    base_dir = r"C:\Users\estro\Desktop\rcp-model"
+    csv_to_npy(os.path.join(base_dir, "keypoints.csv"), os.path.join(base_dir, "keypoints_npy"))
@@ -0,0 +1,25 @@
+import tensorflow as tf
+from tensorflow.keras import layers, models
+
+# MLP de modeltrainer.py: 128-64-32 para los 132 landmarks crudos
+HIDDEN_RAW = (128, 64, 32)
+# con pose_features.py la entrada ya es compacta y basta una red mucho más pequeña
+HIDDEN_POSE = (32, 16)
+DROPOUT = (0.3, 0.25)
+
+def build_model(input_dim, hidden=HIDDEN_RAW, dropout=DROPOUT, learning_rate=1e-3):
+    """Dense + BatchNorm + Dropout en todas las capas ocultas menos la última, salida sigmoid"""
+    stack = [layers.Input(shape=(input_dim,))]
+    for i, units in enumerate(hidden):
+        stack.append(layers.Dense(units, activation="relu"))
+        if i < len(hidden) - 1:
+            stack.append(layers.BatchNormalization())
+            stack.append(layers.Dropout(dropout[min(i, len(dropout) - 1)]))
+    stack.append(layers.Dense(1, activation="sigmoid"))
+    model = models.Sequential(stack)
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+        loss="binary_crossentropy",
+        metrics=["accuracy"]
+    )
+    return model
@@ -1,34 +1,41 @@
 # train_model.py
 import os
 import numpy as np
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import tensorflow as tf
-from tensorflow.keras import layers, models, callbacks
+from tensorflow.keras import layers, callbacks
 import joblib
+from keypoints_io import has_npy, load_keypoints
+from pose_augment import PoseAugmenter, augment_keypoints
+from pose_features import pose_features
+from keypoints_model import build_model, HIDDEN_RAW, HIDDEN_POSE
 
 # Rutas
 CSV_PATH = r"C:\Users\estro\Desktop\rcp-model\keypoints.csv"
+# Formato binario de extractor.py; si existe se usa en lugar del CSV
+NPY_DIR = r"C:\Users\estro\Desktop\rcp-model\keypoints_npy"
 OUT_DIR = r"C:\Users\estro\Desktop\rcp-model\trained"
 os.makedirs(OUT_DIR, exist_ok=True)
-MODEL_PATH = os.path.join(OUT_DIR, "rcp_keypoints_model.h5")
+# Entrada del modelo: "raw" = 132 landmarks (lo que usa la app hoy) o "pose" = pose_features.py
+# (tren superior normalizado + ángulos, red 32-16); compare_features.py compara los dos
+FEATURES = "raw"
+name = "rcp_keypoints_model" if FEATURES == "raw" else "rcp_pose_model"
+MODEL_PATH = os.path.join(OUT_DIR, f"{name}.h5")
+# Mismo modelo con el StandardScaler integrado en la primera Dense: recibe la entrada sin normalizar
+# (landmarks crudos con FEATURES="raw"; pose_features sin escalar con FEATURES="pose")
+RAW_MODEL_PATH = os.path.join(OUT_DIR, f"{name}_raw.h5")
+SCALER_PATH = os.path.join(OUT_DIR, "scaler.save" if FEATURES == "raw" else "pose_scaler.save")
+TFJS_DIR = os.path.join(OUT_DIR, "tfjs_model" if FEATURES == "raw" else "tfjs_pose_model")
+# Guardar también scaler.save (solo lo necesita el modelo sin scaler integrado)
+SAVE_SCALER = True
+# Variantes aumentadas por fila de train, generadas sobre los landmarks (pose_augment.py);
+# 0 = sin aumento. Sustituye a augmentation.py + volver a pasar cada variante por extractor.py
+AUGMENT_COPIES = 0
 
-# ---------- 1) Cargar CSV ----------
-print("Cargando CSV:", CSV_PATH)
-df = pd.read_csv(CSV_PATH)
-print("Shape CSV:", df.shape)
-
-# Última columna = label
-if df.columns[-1].lower() != "label":
-    df = df.rename(columns={df.columns[-1]: "label"})
-
-# ---------- 2) Limpieza ----------
-df = df.dropna(axis=0, how="any")
-
-# ---------- 3) Separar X, y ----------
-X = df.drop(columns=["label"]).values.astype(np.float32)
-y = df["label"].values.astype(np.int32)
+# ---------- 1-3) Cargar keypoints (binario mmap si existe, si no el CSV) sin filas con NaN ----------
+print("Cargando keypoints:", NPY_DIR if has_npy(NPY_DIR) else CSV_PATH)
+X, y = load_keypoints(NPY_DIR, CSV_PATH)
 print("X shape:", X.shape, "y shape:", y.shape)
 
 # ---------- 4) Train/Test split ----------
@@ -38,31 +45,27 @@ X_train, X_test, y_train, y_test = train_test_split(
 print("Train:", X_train.shape, y_train.shape, "Test:", X_test.shape, y_test.shape)
 
 # ---------- 5) Normalización ----------
+# el aumento trabaja sobre landmarks: se aplica antes de calcular las features
+features = pose_features if FEATURES == "pose" else (lambda X: X)
 scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
+X_test_raw = X_test = features(X_test)
+if AUGMENT_COPIES:
+    # validación apartada antes de aumentar: ninguna variante de una fila de train cae en val
+    X_train, X_val, y_train, y_val = train_test_split(
+        X_train, y_train, test_size=0.15, random_state=42, stratify=y_train
+    )
+    X_val = scaler.fit(features(X_train)).transform(features(X_val))  # estadísticas de las poses reales
+    X_train, y_train = augment_keypoints(X_train, y_train, PoseAugmenter(), AUGMENT_COPIES)
+    X_train = scaler.transform(features(X_train))
+else:
+    X_train = scaler.fit_transform(features(X_train))
 X_test = scaler.transform(X_test)
-joblib.dump(scaler, os.path.join(OUT_DIR, "scaler.save"))
-print("Scaler guardado.")
+if SAVE_SCALER:
+    joblib.dump(scaler, SCALER_PATH)
+    print("Scaler guardado.")
 
 # ---------- 6) Modelo (MLP simple) ----------
-input_dim = X_train.shape[1]
-model = models.Sequential([
-    layers.Input(shape=(input_dim,)),
-    layers.Dense(128, activation="relu"),
-    layers.BatchNormalization(),
-    layers.Dropout(0.3),
-    layers.Dense(64, activation="relu"),
-    layers.BatchNormalization(),
-    layers.Dropout(0.25),
-    layers.Dense(32, activation="relu"),
-    layers.Dense(1, activation="sigmoid")
-])
-
-model.compile(
-    optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
-    loss="binary_crossentropy",
-    metrics=["accuracy"]
-)
+model = build_model(X_train.shape[1], HIDDEN_RAW if FEATURES == "raw" else HIDDEN_POSE)
 model.summary()
 
 # ---------- 7) Callbacks ----------
@@ -72,9 +75,10 @@ tb_dir = os.path.join(OUT_DIR, "tb_logs")
 tb = callbacks.TensorBoard(log_dir=tb_dir)
 
 # ---------- 8) Entrenamiento ----------
+validation = {"validation_data": (X_val, y_val)} if AUGMENT_COPIES else {"validation_split": 0.15}
 history = model.fit(
     X_train, y_train,
-    validation_split=0.15,
+    **validation,
     epochs=200,
     batch_size=32,
     callbacks=[es, mc, tb],
@@ -86,8 +90,33 @@ loss, acc = model.evaluate(X_test, y_test, verbose=0)
 print(f"Test loss: {loss:.4f}  Test accuracy: {acc:.4f}")
 print("Modelo guardado en:", MODEL_PATH)
 
-# ---------- 10) Instrucción TF.js ----------
+# ---------- 10) Modelo con el scaler integrado ----------
+def fold_scaler(model, scaler):
+    """(x - mean) / scale seguido de Dense(W, b) es Dense(W / scale, b - (mean / scale) @ W):
+    mismo resultado, sin capa ni operación extra por frame"""
+    raw = tf.keras.models.clone_model(model)
+    raw.set_weights(model.get_weights())
+    first = next(l for l in raw.layers if isinstance(l, layers.Dense))
+    W, b = [w.astype(np.float64) for w in first.get_weights()]
+    W_raw = W / scaler.scale_[:, None]
+    b_raw = b - (scaler.mean_ / scaler.scale_) @ W
+    first.set_weights([W_raw.astype(np.float32), b_raw.astype(np.float32)])
+    return raw
+
+raw_model = fold_scaler(model, scaler)
+raw_model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
+diff = np.abs(raw_model.predict(X_test_raw, verbose=0) - model.predict(X_test, verbose=0)).max()
+raw_model.save(RAW_MODEL_PATH)
+print(f"Modelo con scaler integrado guardado en: {RAW_MODEL_PATH} (diferencia máx.: {diff:.2e})")
+
+# ---------- 11) Instrucción TF.js ----------
 print("\n--- CONVERTIR A TF.JS ---")
 print("Instala tensorflowjs si no lo tienes:")
 print("    pip install tensorflowjs")
-print(f"tensorflowjs_converter --input_format=keras {MODEL_PATH} {os.path.join(OUT_DIR, 'tfjs_model')}")
+print(f"tensorflowjs_converter --input_format=keras {MODEL_PATH} {TFJS_DIR}")
+if FEATURES == "raw":
+    print("Con el scaler integrado (la app pasa los landmarks sin normalizar):")
+else:
+    print("Con el scaler integrado (la app calcula pose_features.py sobre los landmarks y los pasa sin normalizar;")
+    print("Technique.tsx todavía envía los 132 landmarks, así que hace falta portar pose_features antes de usarlo):")
+print(f"tensorflowjs_converter --input_format=keras {RAW_MODEL_PATH} {TFJS_DIR}_raw")
@@ -0,0 +1,67 @@
+import time
+import numpy as np
+from keypoints_io import NUM_KEYPOINTS
+
+# Pares izquierda/derecha de MediaPipe Pose (ojos, orejas, boca, hombros, codos, muñecas,
+# dedos, caderas, rodillas, tobillos, talones y pies); la nariz (0) no tiene pareja
+LEFT_RIGHT_PAIRS = [(1, 4), (2, 5), (3, 6), (7, 8), (9, 10), (11, 12), (13, 14), (15, 16),
+                    (17, 18), (19, 20), (21, 22), (23, 24), (25, 26), (27, 28), (29, 30), (31, 32)]
+FLIP_INDEX = np.arange(NUM_KEYPOINTS)
+for a, b in LEFT_RIGHT_PAIRS:
+    FLIP_INDEX[a], FLIP_INDEX[b] = b, a
+
+class PoseAugmenter:
+    """Aumento directo sobre los landmarks (filas de 132 = 33 x (x, y, z, visibility)).
+
+    Sustituye a generar variantes de cada foto y volver a pasarlas por MediaPipe:
+    todo el lote se transforma con operaciones de NumPy. x e y están normalizadas
+    a la imagen (0-1); z usa la misma escala que x y no cambia con el giro en el plano.
+    """
+
+    def __init__(self, flip_prob=0.5, rotation_range=10, scale_range=0.1, shift_range=0.05,
+                 visibility_dropout=0.05, seed=42):
+        self.flip_prob = flip_prob
+        self.rotation_range = rotation_range          # grados, U(-r, r)
+        self.scale_range = scale_range                # factor 1 + U(-r, r), también para z
+        self.shift_range = shift_range                # fracción de la imagen, U(-r, r) en x e y
+        self.visibility_dropout = visibility_dropout  # prob. de marcar un landmark como no visible
+        self.rng = np.random.default_rng(seed)
+
+    def apply(self, X):
+        """X (n, 132) -> copia aumentada (n, 132) float32"""
+        P = np.asarray(X, dtype=np.float32).reshape(-1, NUM_KEYPOINTS, 4).copy()
+        n = len(P)
+        sym = lambda r, *shape: self.rng.uniform(-r, r, (n, *shape)).astype(np.float32)
+
+        # espejo: x -> 1 - x y el landmark izquierdo pasa a ser el derecho
+        flip = self.rng.random(n) < self.flip_prob
+        P[flip] = P[flip][:, FLIP_INDEX]
+        P[flip, :, 0] = 1 - P[flip, :, 0]
+
+        # giro y escala alrededor del centro de la pose, luego traslación
+        center = P[:, :, :2].mean(axis=1, keepdims=True)
+        theta = np.deg2rad(sym(self.rotation_range))
+        scale = 1 + sym(self.scale_range)
+        cos, sin = np.cos(theta)[:, None], np.sin(theta)[:, None]
+        dx, dy = P[:, :, 0] - center[:, :, 0], P[:, :, 1] - center[:, :, 1]
+        shift = sym(self.shift_range, 2)
+        P[:, :, 0] = scale[:, None] * (cos * dx - sin * dy) + center[:, :, 0] + shift[:, :1]
+        P[:, :, 1] = scale[:, None] * (sin * dx + cos * dy) + center[:, :, 1] + shift[:, 1:]
+        P[:, :, 2] *= scale[:, None]
+
+        # oclusiones: MediaPipe sigue dando coordenadas, pero con visibilidad casi nula
+        dropped = self.rng.random((n, NUM_KEYPOINTS)) < self.visibility_dropout
+        P[:, :, 3] = np.where(dropped, 0.0, P[:, :, 3])
+        return P.reshape(n, -1)
+
+def augment_keypoints(X, y, augmenter, copies, shuffle=True):
+    """Originales + `copies` variantes aumentadas de cada fila (mezcladas)"""
+    start = time.perf_counter()
+    X_aug = np.concatenate([np.asarray(X, dtype=np.float32)] + [augmenter.apply(X) for _ in range(copies)])
+    y_aug = np.concatenate([np.asarray(y)] * (copies + 1))
+    if shuffle:
+        order = augmenter.rng.permutation(len(X_aug))
+        X_aug, y_aug = X_aug[order], y_aug[order]
+    elapsed = time.perf_counter() - start
+    print(f"🔀 {len(X) * copies} filas aumentadas en {elapsed:.2f}s ({len(X) * copies / max(elapsed, 1e-9):,.0f} filas/s)")
+    return X_aug, y_aug
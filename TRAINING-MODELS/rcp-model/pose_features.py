@@ -0,0 +1,52 @@
+import numpy as np
+from keypoints_io import NUM_KEYPOINTS
+
+# Representación compacta de la postura de RCP a partir de las filas de 132 valores:
+# solo tren superior (+ caderas), sin depender de dónde ni de qué tamaño sale la persona
+NOSE, L_SHOULDER, R_SHOULDER, L_ELBOW, R_ELBOW, L_WRIST, R_WRIST = 0, 11, 12, 13, 14, 15, 16
+L_HIP, R_HIP, L_KNEE, R_KNEE = 23, 24, 25, 26
+UPPER_BODY = [NOSE, L_SHOULDER, R_SHOULDER, L_ELBOW, R_ELBOW, L_WRIST, R_WRIST, L_HIP, R_HIP]
+# (a, vértice, b): codos, hombros y caderas
+ANGLES = {
+    "elbow_l": (L_SHOULDER, L_ELBOW, L_WRIST), "elbow_r": (R_SHOULDER, R_ELBOW, R_WRIST),
+    "shoulder_l": (L_ELBOW, L_SHOULDER, L_HIP), "shoulder_r": (R_ELBOW, R_SHOULDER, R_HIP),
+    "hip_l": (L_SHOULDER, L_HIP, L_KNEE), "hip_r": (R_SHOULDER, R_HIP, R_KNEE),
+}
+FEATURE_NAMES = (
+    [f"{c}{i}" for i in UPPER_BODY for c in "xy"]
+    + [f"angle_{name}" for name in ANGLES]
+    + ["wrists_dist", "wrists_dx", "wrists_dy", "torso_tilt"]
+    + [f"v{i}" for i in UPPER_BODY]
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+def _angle(P, a, b, c):
+    """Ángulo en b (0 = cerrado, 1 = extendido) en el plano de la imagen"""
+    u, v = P[:, a, :2] - P[:, b, :2], P[:, c, :2] - P[:, b, :2]
+    cos = (u * v).sum(-1) / (np.linalg.norm(u, axis=-1) * np.linalg.norm(v, axis=-1) + 1e-6)
+    return np.arccos(np.clip(cos, -1, 1)) / np.pi
+
+def pose_features(X):
+    """X (n, 132) -> (n, NUM_FEATURES) float32, invariante a traslación y escala.
+
+    Origen en el punto medio de los hombros y unidad = longitud del torso (hombros-caderas),
+    que a diferencia del ancho de hombros no se colapsa cuando la cámara está de lado.
+    """
+    P = np.asarray(X, dtype=np.float32).reshape(-1, NUM_KEYPOINTS, 4)
+    shoulders = (P[:, L_SHOULDER, :2] + P[:, R_SHOULDER, :2]) / 2
+    hips = (P[:, L_HIP, :2] + P[:, R_HIP, :2]) / 2
+    torso = hips - shoulders
+    unit = np.linalg.norm(torso, axis=-1, keepdims=True) + 1e-6
+
+    coords = (P[:, UPPER_BODY, :2] - shoulders[:, None]) / unit[:, None]
+    angles = np.stack([_angle(P, *abc) for abc in ANGLES.values()], axis=1)
+    # manos sobre el pecho: juntas y bajo los hombros
+    wrists = (P[:, L_WRIST, :2] + P[:, R_WRIST, :2]) / 2
+    wrists_dist = np.linalg.norm(P[:, L_WRIST, :2] - P[:, R_WRIST, :2], axis=-1, keepdims=True) / unit
+    wrists_offset = (wrists - shoulders) / unit
+    # inclinación del torso respecto a la vertical (0 = erguido, ±1 = horizontal)
+    tilt = np.arctan2(torso[:, :1], torso[:, 1:]) / (np.pi / 2)
+    visibility = P[:, UPPER_BODY, 3]
+    return np.concatenate([
+        coords.reshape(len(P), -1), angles, wrists_dist, wrists_offset, tilt, visibility,
+    ], axis=1).astype(np.float32)
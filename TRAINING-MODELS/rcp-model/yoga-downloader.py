@@ -1,50 +1,78 @@
 import os
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+import time
+# downloader.py es común a los modelos (en TRAINING-MODELS/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from downloader import Downloader
+from download_ledger import DownloadLedger
 
 # Carpeta donde están los .txt
 dataset_dir = r"C:\Users\estro\Desktop\rcp-model\dataset_yoga"
 # Carpeta donde guardaremos las imágenes NO-RCP
 output_dir = r"C:\Users\estro\Desktop\rcp-model\NO-RCP"
 os.makedirs(output_dir, exist_ok=True)
+# Registro de descargas: permite reanudar y no reintentar URLs muertas
+ledger_path = os.path.join(dataset_dir, "yoga_downloads.sqlite")
 
 # Número de imágenes a tomar de cada archivo
 num_images = 20
-# Número de hilos
+# Número de hilos y conexiones simultáneas por host
 num_threads = 8
+per_host = 4
+# Intentos máximos por URL sumando todas las ejecuciones (404/403... no se reintentan nunca)
+max_attempts = 6
+# Cada cuántos resultados se muestra el progreso
+progress_every = 25
 
-def download_image(args):
-    local_path, url = args
-    img_name = os.path.basename(local_path)
-    save_path = os.path.join(output_dir, img_name)
-    try:
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 200:
-            with open(save_path, "wb") as img_file:
-                img_file.write(resp.content)
-            return f"✅ Descargada: {img_name}"
-        else:
-            return f"❌ Error {resp.status_code}: {url}"
-    except Exception as e:
-        return f"❌ No se pudo descargar {url}: {e}"
-
-# Recolectamos todas las imágenes a descargar
-tasks = []
+def describe(result):
+    img_name = os.path.basename(result.path) if result.path else ""
+    if result.status == "ok":
+        return f"✅ Descargada: {img_name}"
+    if result.status == "exists":
+        return f"⏭️ Ya existe: {img_name}"
+    if result.http_code and result.http_code >= 400:
+        return f"❌ Error {result.http_code}: {result.url}"
+    return f"❌ No se pudo descargar {result.url}: {result.error}"
+
+ledger = DownloadLedger(ledger_path)
+
+# Registramos las imágenes a descargar (solo se vuelven a leer los .txt que cambiaron)
 for txt_file in os.listdir(dataset_dir):
     if txt_file.endswith(".txt"):
         txt_path = os.path.join(dataset_dir, txt_file)
+        if not ledger.source_changed(txt_path):
+            continue
         with open(txt_path, "r", encoding="utf-8") as f:
             lines = f.readlines()
+        jobs = []
         for line in lines[:num_images]:
             parts = line.strip().split("\t")
             if len(parts) < 2:
                 continue
-            tasks.append((parts[0], parts[1]))
+            jobs.append((parts[1], os.path.join(output_dir, os.path.basename(parts[0]))))
+        ledger.add(jobs)
+        ledger.mark_source(txt_path)
+
+found, missing = ledger.sync_with_disk()
+jobs = ledger.pending(max_attempts)
+print(f"📋 Estado previo: {ledger.summary()} ({found} ya estaban en disco, {missing} borradas de disco)")
+print(f"⬇️ {len(jobs)} URLs pendientes o reintentables")
+
+# Descargar en paralelo (conexiones reutilizadas, escritura por bloques y reintentos)
+downloader = Downloader(max_workers=num_threads, per_host=per_host)
+start = time.perf_counter()
+total_bytes = 0
+for i, result in enumerate(downloader.download_many(jobs), 1):
+    ledger.record(result)
+    total_bytes += result.bytes if result.status == "ok" else 0
+    print(describe(result))
+    if i % progress_every == 0 or i == len(jobs):
+        ledger.commit()  # si se interrumpe, lo descargado ya quedó registrado
+        elapsed = time.perf_counter() - start
+        print(f"📊 {i}/{len(jobs)} — {i / max(elapsed, 1e-9):.1f} URLs/s, "
+              f"{total_bytes / 1e6 / max(elapsed, 1e-9):.2f} MB/s")
 
-# Descargar en paralelo
-with ThreadPoolExecutor(max_workers=num_threads) as executor:
-    futures = [executor.submit(download_image, task) for task in tasks]
-    for future in as_completed(futures):
-        print(future.result())
+print(f"📋 Estado final: {ledger.summary()}")
+ledger.close()
 
 print("✅ Descarga completada")